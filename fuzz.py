@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# encoding: utf-8
+""" differential fuzzing: turing engines vs the contrib reference
+
+    Generates random machines and input tapes, runs each through
+    contrib/turing_machine.py and every turing engine, and compares the tape
+    (non-blank symbols by index), head position, state and step count.
+    Failing cases get shrunk before they're reported, and are printed in the
+    JSON machine format so they can be replayed with `python -m turing run`.
+"""
+
+import os
+import sys
+import json
+import random
+import logging
+import argparse
+import importlib.util
+from time import perf_counter
+
+from turing.tape import PagedTape, BLANK_SYMBOL
+from turing.state import State as S
+from turing.stream import StreamTape
+from turing.machine import TuringMachine
+from turing.compiled import CompiledMachine
+from turing.grid import GridMachine
+from turing.events import EventStream, WRITE, MOVE, STATE
+
+log = logging.getLogger('fuzz')
+
+REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'contrib', 'turing_machine.py')
+
+SYMBOLS = '01a' + BLANK_SYMBOL
+MOVES = 'LRN'
+INITIAL = 'q0'
+FINAL = 'halt'
+
+def _load_reference():
+    spec = importlib.util.spec_from_file_location('turing_reference', REFERENCE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+_reference = None
+
+class Case:
+    """ a machine as {(state, sym): (next, write, move)}, an input tape and a step limit """
+
+    def __init__(self, table, tape, max_steps):
+        self.table = table
+        self.tape = tape
+        self.max_steps = max_steps
+
+    @classmethod
+    def generate(cls, seed):
+        rng = random.Random(seed)
+        states = [ f'q{i}' for i in range(rng.randint(1, 5)) ]
+        table = dict()
+        for state in states:
+            for sym in SYMBOLS:
+                if rng.random() < 0.85:
+                    nxt = FINAL if rng.random() < 0.1 else rng.choice(states)
+                    table[state, sym] = (nxt, rng.choice(SYMBOLS), rng.choice(MOVES))
+        tape = ''.join( rng.choice(SYMBOLS) for _ in range(rng.randint(0, 12)) )
+        return cls(table, tape, rng.randint(1, 200))
+
+    def transitions(self):
+        return { S(state, sym): S(*nxt) for (state, sym), nxt in self.table.items() }
+
+    def as_json(self):
+        return json.dumps({
+            'initial': INITIAL,
+            'final': [ FINAL ],
+            'transitions': [ [list(k), list(v)] for k,v in self.table.items() ],
+            'tape': self.tape,
+            'max_steps': self.max_steps,
+        }, indent=2)
+
+def _tape_dict(pairs):
+    return { i: sym for i, sym in pairs if sym != BLANK_SYMBOL }
+
+def _from_tape(tape):
+    return _tape_dict( (i - tape.offset, sym) for i, sym in enumerate(tape.tape) )
+
+def run_reference(case):
+    global _reference
+    if _reference is None:
+        _reference = _load_reference()
+    tm = _reference.TuringMachine(case.tape, initial_state=INITIAL, final_states={FINAL},
+        transition_function=case.table)
+    steps = 0
+    while not tm.final() and steps < case.max_steps:
+        tm.step()
+        steps += 1
+    tape = tm._TuringMachine__tape._Tape__tape
+    return _tape_dict(tape.items()), tm._TuringMachine__head_position, tm._TuringMachine__current_state, steps
+
+def _run_turing(tm, case):
+    tm.run(case.max_steps)
+    return _from_tape(tm.tape), tm.pos, tm.state.name, tm.stepno
+
+def run_step(case):
+    return _run_turing(TuringMachine(tape=case.tape, initial_state=INITIAL, final_states=FINAL,
+        transition_function=case.transitions()), case)
+
+def run_compiled(case):
+    return _run_turing(CompiledMachine(tape=case.tape, initial_state=INITIAL, final_states=FINAL,
+        transition_function=case.transitions()), case)
+
+def run_paged(case):
+    tm = TuringMachine(tape=case.tape, initial_state=INITIAL, final_states=FINAL,
+        transition_function=case.transitions())
+    tm.tape = PagedTape(tm.tape, page_size=4)
+    return _run_turing(tm, case)
+
+def run_stream(case):
+    chunks = [ case.tape[i:i+3] for i in range(0, len(case.tape), 3) ]
+    tm = TuringMachine(tape=StreamTape(chunks, bs=3), initial_state=INITIAL,
+        final_states=FINAL, transition_function=case.transitions())
+    tm.run(case.max_steps)
+    tm.tape.drain() # the part of the input it never got to is still input
+    return _from_tape(tm.tape), tm.pos, tm.state.name, tm.stepno
+
+def run_grid(case):
+    gm = GridMachine(tape=case.tape, initial_state=INITIAL, final_states=FINAL,
+        transition_function=case.transitions())
+    gm.run(case.max_steps)
+    window = gm.tape.bbox()
+    tape = dict()
+    if window is not None:
+        x0, y0, x1, y1 = window
+        if (y0, y1) != (0, 1):
+            raise ValueError('a 1-D machine left row 0 of the grid')
+        tape = _tape_dict( (x0 + i, sym) for i, sym in enumerate(gm.tape.export(window)[0]) )
+    return tape, gm.pos[0], gm.state.name, gm.stepno
+
+def run_observed(case):
+    """ the compiled engine, but the answer comes from replaying its events """
+    cm = CompiledMachine(tape=case.tape, initial_state=INITIAL, final_states=FINAL,
+        transition_function=case.transitions())
+    stream = cm.subscribe(EventStream(capacity=case.max_steps * 4 + 4, overflow='drop_newest'))
+    cm.run(case.max_steps)
+    tape, pos, state = dict(enumerate(case.tape)), 0, INITIAL
+    for e in stream.drain():
+        if e.kind == WRITE:
+            tape[e.pos] = e.new
+        elif e.kind == MOVE:
+            pos = e.new
+        elif e.kind == STATE:
+            state = e.new
+    return _tape_dict(tape.items()), pos, state, cm.stepno
+
+ENGINES = {
+    'step': run_step,
+    'compiled': run_compiled,
+    'paged': run_paged,
+    'stream': run_stream,
+    'grid': run_grid,
+    'observed': run_observed,
+}
+
+def compare(case, engines=ENGINES):
+    """ returns ({engine: (expected, got)} for each mismatch, {engine: (steps, seconds)}) """
+    timing = dict()
+    start = perf_counter()
+    expected = run_reference(case)
+    timing['reference'] = (expected[3], perf_counter() - start)
+
+    mismatches = dict()
+    for name in engines:
+        start = perf_counter()
+        try:
+            got = ENGINES[name](case)
+        except Exception as e: # a crash is as much a divergence as a wrong answer
+            got = repr(e)
+        timing[name] = (expected[3], perf_counter() - start)
+        if got != expected:
+            mismatches[name] = (expected, got)
+    return mismatches, timing
+
+def _fails(case, engine):
+    return engine in compare(case, [engine])[0]
+
+def shrink(case, engine):
+    """ the smallest case (by greedy deletion) that still fails on engine """
+    improved = True
+    while improved:
+        improved = False
+        for key in list(case.table):
+            smaller = Case({ k: v for k,v in case.table.items() if k != key }, case.tape, case.max_steps)
+            if _fails(smaller, engine):
+                case, improved = smaller, True
+        for i in range(len(case.tape)):
+            smaller = Case(case.table, case.tape[:i] + case.tape[i+1:], case.max_steps)
+            if _fails(smaller, engine):
+                case, improved = smaller, True
+                break
+        lo, hi = 0, case.max_steps
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _fails(Case(case.table, case.tape, mid), engine):
+                hi = mid
+            else:
+                lo = mid + 1
+        if hi < case.max_steps and _fails(Case(case.table, case.tape, hi), engine):
+            case, improved = Case(case.table, case.tape, hi), True
+    return case
+
+def check(seed):
+    """ run one generated case; returns (seed, mismatches, timing) """
+    mismatches, timing = compare(Case.generate(seed))
+    return seed, mismatches, timing
+
+def fuzz(seed=0, count=1000, workers=None):
+    """ yields check() results for count cases, on a process pool if workers > 1 """
+    seeds = range(seed, seed + count)
+    if workers is None or workers <= 1:
+        yield from map(check, seeds)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as pool:
+        yield from pool.map(check, seeds, chunksize=max(1, count // (workers * 8)))
+
+def main(args):
+    totals = dict()
+    failures = list()
+    for seed, mismatches, timing in fuzz(args.seed, args.count, args.workers):
+        for name, (steps, elapsed) in timing.items():
+            s, e = totals.get(name, (0, 0.0))
+            totals[name] = (s + steps, e + elapsed)
+        if mismatches:
+            failures.append( (seed, mismatches) )
+            if len(failures) >= args.max_failures:
+                break
+
+    for name, (steps, elapsed) in totals.items():
+        rate = steps / elapsed if elapsed else 0
+        print(f'{name}: {steps} steps, {elapsed:.3f}s, {rate:.0f} steps/s')
+
+    for seed, mismatches in failures:
+        for engine, (expected, got) in mismatches.items():
+            case = shrink(Case.generate(seed), engine)
+            expected, got = compare(case, [engine])[0][engine]
+            print(f'\nseed {seed}: {engine} differs from the reference')
+            print(f'  expected (tape, pos, state, steps): {expected}')
+            print(f'  got: {got}')
+            print(case.as_json())
+
+    print(f'\n{len(failures)} failing cases')
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('-v', '--verbose', action='store_true')
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-n', '--count', type=int, default=1000)
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count())
+    parser.add_argument('-f', '--max-failures', type=int, default=10)
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.ERROR)
+
+    try: sys.exit(main(args))
+    except KeyboardInterrupt: pass
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+# coding: utf-8
+""" machines and tapes shared by several test modules
+
+    conftest.py holds the fixtures; these are plain values (they go into
+    parametrize lists and fixture params), so test modules import them.
+"""
+
+from turing.state import State as S
+from turing.tape import PagedTape, BLANK_SYMBOL
+
+# flip every bit of the input, halting on the blank after it
+FLIP = {
+    S('init', 0): S('init', 1, 'R'),
+    S('init', 1): S('init', 0, 'R'),
+    S('init', BLANK_SYMBOL): S('final', BLANK_SYMBOL, 'N'),
+}
+
+# walk left over the input, then right to the end, flipping 0s on the way back
+BOUNCE = {
+    S('init', 0): S('init', 0, 'L'),
+    S('init', 1): S('init', 1, 'L'),
+    S('init', BLANK_SYMBOL): S('back', BLANK_SYMBOL, 'R'),
+    S('back', 0): S('back', 1, 'R'),
+    S('back', 1): S('back', 1, 'R'),
+    S('back', BLANK_SYMBOL): S('final', BLANK_SYMBOL, 'N'),
+}
+
+class SmallPagedTape(PagedTape):
+    """ pages small enough that short test tapes span several """
+    page_size = 4
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import marshal
+import pytest
+
+import turing.cache
+from turing.cache import CompiledCache, table_key
+from turing.compiled import compile_table, CompiledMachine
+from turing.state import State as S
+
+from helpers import FLIP
+
+class Name(str):
+    """ marshal won't take str subclasses, so these don't get cached """
+
+@pytest.fixture
+def cache(tmp_path):
+    return CompiledCache(str(tmp_path / 'cache'))
+
+def test_table_key_ignores_order():
+    assert table_key(FLIP) == table_key(dict(reversed(list(FLIP.items()))))
+    assert table_key(FLIP) != table_key({ S('init', 0): S('init', 1, 'L') })
+
+def test_roundtrip(cache):
+    table = compile_table(FLIP)
+    cache.put('flip', table)
+    assert cache.get('flip') == table
+    assert cache.get('flop') is None
+
+def test_not_marshallable(cache, tmp_path):
+    cache.put('named', { (Name('init'), '0'): (Name('final'), '1', 1) })
+    assert cache.get('named') is None
+    assert not (tmp_path / 'cache').exists()
+
+def test_stale_version(cache, monkeypatch):
+    cache.put('flip', compile_table(FLIP))
+    monkeypatch.setattr(turing.cache, '__version__', 'next')
+    assert cache.get('flip') is None
+
+def test_corrupt_entry(cache):
+    cache.put('flip', compile_table(FLIP))
+    with open(cache._fname('flip'), 'wb') as fh:
+        fh.write(b'garbage')
+    assert cache.get('flip') is None
+
+def test_old_pickled_entry(cache, tmp_path):
+    # format 1 entries could hold a pickle; they must never get loaded
+    (tmp_path / 'cache').mkdir()
+    with open(cache._fname('named'), 'wb') as fh:
+        marshal.dump( (1, turing.cache.__version__, 'named', 'pickle', b'junk'), fh )
+    assert cache.get('named') is None
+
+def test_compile_warm(cache, monkeypatch):
+    cold = cache.compile(FLIP)
+    monkeypatch.setattr(turing.cache, 'compile_table', None)
+    warm = cache.compile(FLIP)
+    assert warm == cold
+    cm = CompiledMachine(tape='010011', table=warm).run()
+    assert cm.tape.strip() == '101100'
+
+def test_cli_warm_start(tmp_path, capsys, monkeypatch):
+    import json
+    from turing.cli import main
+    machine = tmp_path / 'flip.json'
+    machine.write_text(json.dumps({ 'transitions': [
+        [['init', '0'], ['init', '1', 'R']],
+        [['init', '1'], ['init', '0', 'R']],
+        [['init', ' '], ['final', ' ', 'N']],
+    ]}))
+    cdir = str(tmp_path / 'cache')
+    main(['run', '-c', cdir, str(machine), '-t', '01'])
+    monkeypatch.setattr('turing.cli.parse_machine', None)
+    main(['run', '-c', cdir, str(machine), '-t', '01'])
+    first, second = capsys.readouterr().out.splitlines()
+    assert first.split(',')[:3] == second.split(',')[:3]
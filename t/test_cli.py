@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import pytest
+
+from turing.cli import main, load_machine
+from turing.tape import save_to_tape, BLANK_SYMBOL
+from turing.state import State as S
+
+TRANSITIONS = [
+    [['init', '0'], ['init', '1', 'R']],
+    [['init', '1'], ['init', '0', 'R']],
+    [['init', ' '], ['final', ' ', 'N']],
+]
+
+@pytest.fixture
+def machine_file(tmp_path):
+    path = tmp_path / 'flip.json'
+    path.write_text(json.dumps({ 'initial': 'init', 'final': ['final'], 'transitions': TRANSITIONS }))
+    return str(path)
+
+def test_load_saved_tape(tmp_path):
+    trans = { S(*cur): S(*nxt) for cur,nxt in TRANSITIONS }
+    path = tmp_path / 'flip.tape'
+    path.write_text(str(save_to_tape(S('init'), trans, [S('final')])) + '\n')
+    initial, transitions, final = load_machine(str(path))
+    assert initial == 'init'
+    assert final == ['final']
+    assert list(transitions.items()) == list(trans.items())
+    for k,v in transitions.items():
+        assert tuple(v) == tuple(trans[k])
+
+@pytest.mark.parametrize('engine', ['auto', 'step', 'compiled'])
+def test_run(machine_file, capsys, engine):
+    main(['run', '-e', engine, '-p', machine_file, '-t', '010011'])
+    summary, tape, _ = capsys.readouterr().out.split('\n')
+    assert '7 steps, state=final, pos=6' in summary
+    assert tape == '101100' + BLANK_SYMBOL
+
+def test_batch(machine_file, capsys, tmp_path, monkeypatch):
+    inputs = tmp_path / 'inputs'
+    inputs.mkdir()
+    (inputs / 'a').write_text('01\n')
+    (inputs / 'b').write_text('0011\n')
+    main(['batch', machine_file, str(inputs)])
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 3
+    assert lines[-1].startswith('2 inputs, 8 steps')
+
+def test_batch_stdin(machine_file, capsys, monkeypatch):
+    import io
+    monkeypatch.setattr('sys.stdin', io.StringIO('01\n0011\n1\n'))
+    main(['batch', '-q', machine_file])
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 1
+    assert lines[0].startswith('3 inputs, 10 steps')
+
+def test_bench_stuck(tmp_path, capsys):
+    path = tmp_path / 'stuck.json'
+    path.write_text(json.dumps({ 'transitions': TRANSITIONS[:1] }))
+    main(['bench', '-n', '1', str(path), '-t', '01'])
+    compiled, step = capsys.readouterr().out.splitlines()
+    assert compiled.startswith('compiled: 1 steps')
+    assert step.startswith('step: 1 steps')
+
+def test_batch_stuck_on_step_engine(tmp_path, capsys, monkeypatch):
+    import io
+    path = tmp_path / 'stuck.json'
+    path.write_text(json.dumps({ 'transitions': TRANSITIONS[:1] }))
+    monkeypatch.setattr('sys.stdin', io.StringIO('01\n00\n'))
+    main(['batch', '-e', 'step', str(path)])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith('stdin:1: 1 steps, state=init (stuck)')
+    assert lines[1].startswith('stdin:2: 2 steps, state=init (stuck)')
+
+def test_bench_repeat(machine_file):
+    with pytest.raises(SystemExit):
+        main(['bench', '-n', '0', machine_file])
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import pytest
+
+from turing.state import State as S
+from turing.machine import TuringMachine
+from turing.compiled import CompiledMachine, compile_table
+from turing.tape import BLANK_SYMBOL
+
+from helpers import FLIP
+
+# walk left to the start, then back right writing x's over the 0s; it marks
+# both ends, so it writes onto freshly grown tape and grows on its last step
+MARK = {
+    S('init', 0): S('init', 0, 'L'),
+    S('init', 1): S('init', 1, 'L'),
+    S('init', BLANK_SYMBOL): S('back', '<', 'R'),
+    S('back', 0): S('back', 'x', 'R'),
+    S('back', 1): S('back', 1, 'R'),
+    S('back', BLANK_SYMBOL): S('final', '>', 'R'),
+}
+
+@pytest.mark.parametrize('trans,tape', [
+    (FLIP, '010011'),
+    (FLIP, ''),
+    (MARK, '0110'),
+    (MARK, ''),
+])
+def test_same_as_step_engine(trans, tape):
+    tm = TuringMachine(tape=tape, transition_function=trans).run()
+    cm = CompiledMachine(tape=tape, transition_function=trans).run()
+    for m in tm, cm:
+        assert m.done
+    assert cm.stepno == tm.stepno
+    assert cm.pos == tm.pos
+    assert cm.state == tm.state
+    assert cm.tape.offset == tm.tape.offset
+    assert cm.tape == str(tm.tape)
+
+def test_max_steps():
+    tm = TuringMachine(tape='010011', transition_function=FLIP).run(3)
+    cm = CompiledMachine(tape='010011', transition_function=FLIP).run(3)
+    assert cm.stepno == tm.stepno == 3
+    assert cm.tape == str(tm.tape) == '101011'
+    # a limit the machine is already past stops it straight away, as on the step engine
+    assert cm.run(2).stepno == tm.run(2).stepno == 3
+
+def test_stuck():
+    cm = CompiledMachine(tape='01x', transition_function=FLIP).run()
+    tm = TuringMachine(tape='01x', transition_function=FLIP).run()
+    assert cm.stuck and tm.stuck
+    assert not cm.done
+    assert cm.stepno == tm.stepno == 2
+    assert cm.pos == tm.pos
+
+    # with a limit, both count the steps it would have sat there for
+    cm = CompiledMachine(tape='01x', transition_function=FLIP).run(10)
+    tm = TuringMachine(tape='01x', transition_function=FLIP).run(10)
+    assert cm.stepno == tm.stepno == 10
+
+def test_uncompilable():
+    with pytest.raises(ValueError):
+        compile_table({ S('init', 0): S('final', '00', 'R') })
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import asyncio
+import pytest
+
+from turing.events import EventStream, Event, WRITE, MOVE, STATE, GROW
+from turing.machine import TuringMachine
+from turing.compiled import CompiledMachine
+from turing.state import State as S
+
+from helpers import BOUNCE
+
+def _events(cls, tape='010', **kw):
+    tm = cls(tape=tape, transition_function=BOUNCE)
+    stream = tm.subscribe(EventStream(**kw))
+    tm.run()
+    return tm, stream.drain()
+
+@pytest.mark.parametrize('cls', [ TuringMachine, CompiledMachine ])
+def test_events(cls):
+    tm, events = _events(cls)
+    assert tm.done
+    assert events[:3] == [
+        Event(GROW, 1, -1, 3, 4),
+        Event(WRITE, 1, 0, '0', '0'),
+        Event(MOVE, 1, -1, 0, -1),
+    ]
+    grows = [ e for e in events if e.kind == GROW ]
+    assert [ (e.pos, e.old, e.new) for e in grows ] == [ (-1, 3, 4), (3, 4, 5) ]
+    states = [ (e.stepno, e.old, e.new) for e in events if e.kind == STATE ]
+    assert states == [ (2, 'init', 'back'), (6, 'back', 'final') ]
+
+    # replaying the writes on the input gives the output
+    tape = dict(enumerate('010'))
+    for e in events:
+        if e.kind == WRITE:
+            tape[e.pos] = e.new
+    assert ''.join( tape[i] for i in sorted(tape) ).strip() == str(tm.tape).strip()
+
+def test_engines_agree():
+    assert _events(TuringMachine)[1] == _events(CompiledMachine)[1]
+
+def test_kinds():
+    _, events = _events(CompiledMachine, kinds=[STATE])
+    assert { e.kind for e in events } == { STATE }
+
+def test_no_subscribers():
+    tm = CompiledMachine(tape='010', transition_function=BOUNCE)
+    stream = tm.subscribe(EventStream())
+    tm.unsubscribe(stream)
+    tm.run()
+    assert tm._streams is None
+    assert len(stream) == 0
+
+def test_stuck():
+    trans = { S('init', '0'): S('init', '1', 'R') }
+    plain = CompiledMachine(tape='01', transition_function=trans).run()
+    tm = CompiledMachine(tape='01', transition_function=trans)
+    stream = tm.subscribe(EventStream(kinds=[WRITE, MOVE]))
+    tm.run()
+    assert tm.stuck and plain.stuck
+    assert tm.stepno == plain.stepno == 1
+    assert stream.drain() == [ Event(WRITE, 1, 0, '0', '1'), Event(MOVE, 1, 1, 0, 1) ]
+
+def test_overflow():
+    _, events = _events(CompiledMachine, capacity=4)
+    assert len(events) == 4
+    assert events[-1].kind == STATE
+
+    tm = CompiledMachine(tape='010', transition_function=BOUNCE)
+    stream = tm.subscribe(EventStream(capacity=4, overflow='drop_newest'))
+    tm.run()
+    assert stream.dropped > 0
+    assert stream.drain()[0] == Event(GROW, 1, -1, 3, 4)
+
+    with pytest.raises(ValueError):
+        EventStream(overflow='nope')
+
+def test_block_with_thread():
+    tm = CompiledMachine(tape='01' * 50, transition_function=BOUNCE)
+    stream = tm.subscribe(EventStream(capacity=8, overflow='block'))
+    got = list()
+    stream.start_thread(got.extend, batch_size=3, interval=0.01)
+    tm.run()
+    stream.close()
+    assert stream.dropped == 0
+    assert got == _events(CompiledMachine, tape='01' * 50)[1]
+
+def test_asyncio():
+    async def main():
+        tm = CompiledMachine(tape='010', transition_function=BOUNCE)
+        stream = tm.subscribe(EventStream())
+        tm.run()
+        stream.close()
+        via_batches = [ e async for batch in stream.batches(interval=0.001) for e in batch ]
+
+        # all on the loop's thread, with a queue too small for every batch
+        tm = CompiledMachine(tape='010', transition_function=BOUNCE)
+        stream = tm.subscribe(EventStream())
+        queue = asyncio.Queue(maxsize=1)
+        stream.feed_queue(queue, asyncio.get_running_loop(), batch_size=2, interval=0.001)
+        tm.run()
+        stream.close()
+        via_queue = list()
+        while (batch := await queue.get()) is not None:
+            via_queue.extend(batch)
+
+        tm = CompiledMachine(tape='010', transition_function=BOUNCE)
+        stream = tm.subscribe(EventStream())
+        queue = asyncio.Queue()
+        thread = stream.feed_queue(queue, asyncio.get_running_loop(), interval=0.001)
+        tm.run()
+        await stream.aclose()
+        assert not thread.is_alive()
+        via_aclose = [ e for batch in iter(queue.get_nowait, None) for e in batch ]
+        return via_batches, via_queue, via_aclose
+
+    results = asyncio.run(asyncio.wait_for(main(), 10))
+    assert all( got == _events(CompiledMachine)[1] for got in results )
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import io
+import random
+import pytest
+
+from turing.tape import Tape, PagedTape, BLANK_SYMBOL
+from turing.stream import StreamTape
+from turing.machine import TuringMachine
+
+from helpers import FLIP
+
+def _fresh(tape):
+    """ what fingerprint() would say without any incremental updates """
+    ret = Tape(tape.tape)
+    ret.offset = tape.offset
+    return ret.fingerprint()
+
+def test_padding():
+    assert Tape('ab').fingerprint() == Tape('ab   ').fingerprint()
+    assert Tape('ab').fingerprint() != Tape('ba').fingerprint()
+    assert Tape('ab').fingerprint() != Tape(' ab').fingerprint()
+
+    tape = Tape('ab')
+    fp = tape.fingerprint()
+    assert tape[-10] == BLANK_SYMBOL
+    assert tape[10] == BLANK_SYMBOL
+    assert tape.fingerprint() == fp
+
+@pytest.mark.parametrize('cls', [ Tape, PagedTape ])
+def test_incremental(cls):
+    rng = random.Random(7)
+    tape = cls('test')
+    tape.fingerprint()
+    for _ in range(500):
+        tape[rng.randint(-40, 40)] = rng.choice('ab' + BLANK_SYMBOL)
+        assert tape.fingerprint() == _fresh(tape)
+
+def test_shifting_writes():
+    tape = Tape('test')
+    tape.fingerprint()
+    tape[1] = 'XX'
+    assert tape.fingerprint() == Tape('tXXst').fingerprint()
+    tape.seek(0)
+    tape.write('ab')
+    assert tape.fingerprint() == Tape('abXst').fingerprint()
+
+def test_forks_keep_their_own():
+    tape = PagedTape('test')
+    fp = tape.fingerprint()
+    fork = tape.fork()
+    fork[0] = 'b'
+    assert tape.fingerprint() == fp
+    assert fork.fingerprint() == Tape('best').fingerprint()
+
+def test_stream():
+    data = 'abcdefghij' * 10
+    whole = Tape(data).fingerprint()
+
+    tape = StreamTape(io.StringIO(data), bs=8, keep_behind=2)
+    tape.fingerprint()
+    assert tape[99] == 'j'
+    assert tape.discarded
+    assert tape.fingerprint() == whole
+
+    tape = StreamTape(io.StringIO(data), bs=8, keep_behind=2, spill=True)
+    assert tape[99] == 'j'
+    assert tape.fingerprint() == whole
+    assert tape[0] == 'a'
+    tape[0] = 'A'
+    assert tape.fingerprint() == Tape('A' + data[1:]).fingerprint()
+
+def test_machine():
+    a = TuringMachine(tape='0110', transition_function=FLIP)
+    b = TuringMachine(tape='0110  ', transition_function=FLIP)
+    assert a.fingerprint() == b.fingerprint()
+    a.step()
+    assert a.fingerprint() != b.fingerprint()
+    b.step()
+    assert a.fingerprint() == b.fingerprint()
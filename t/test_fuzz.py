@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import fuzz
+
+def test_engines_agree():
+    for seed, mismatches, timing in fuzz.fuzz(seed=100, count=20):
+        assert mismatches == {}, f'seed {seed}'
+        assert set(timing) == { 'reference' } | set(fuzz.ENGINES)
+
+def test_shrink(monkeypatch):
+    def broken(case):
+        """ the compiled engine, but it loses every 'a' it writes """
+        tape, pos, state, steps = fuzz.run_compiled(case)
+        return { i: s for i,s in tape.items() if s != 'a' }, pos, state, steps
+    monkeypatch.setitem(fuzz.ENGINES, 'broken', broken)
+
+    case = next( fuzz.Case.generate(seed) for seed in range(1000)
+        if 'broken' in fuzz.compare(fuzz.Case.generate(seed), ['broken'])[0] )
+    small = fuzz.shrink(case, 'broken')
+    assert 'broken' in fuzz.compare(small, ['broken'])[0]
+    assert len(small.table) <= 1
+    assert len(small.tape) <= 1
+    assert small.max_steps <= 1
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from turing.grid import GridTape, GridMachine
+from turing.state import State as S
+from turing.tape import BLANK_SYMBOL
+
+LANGTON = {
+    S('ant', BLANK_SYMBOL): S('ant', '#', 'TR'),
+    S('ant', '#'): S('ant', BLANK_SYMBOL, 'TL'),
+}
+
+def test_grid_tape():
+    tape = GridTape('ab\n c', chunk_size=4)
+    assert tape[0, 0] == 'a'
+    assert tape[1, 1] == 'c'
+    assert tape[-100, 7] == BLANK_SYMBOL
+    assert len(tape.chunks) == 1
+
+    tape[-1, -1] = 'z'
+    assert len(tape.chunks) == 2
+    assert tape.bbox() == (-1, -1, 2, 2)
+    assert tape.render() == 'z  \n ab\n  c'
+    assert tape.export( (0, 0, 1, 3) ) == [ 'a', ' ', ' ' ]
+    assert len(tape) == 4
+    assert tape == 'z  \n ab\n  c'
+
+def test_langton_square():
+    ant = GridMachine(initial_state='ant', transition_function=LANGTON).run(4)
+    assert ant.pos == (0, 0)
+    assert ant.heading == 'N'
+    assert ant.tape.render() == '##\n##'
+    ant.step()
+    assert ant.pos == (-1, 0)
+    assert ant.heading == 'W'
+    assert ant.tape.render() == ' #\n##'
+    # already past the limit, so it doesn't move
+    assert ant.run(3).stepno == 5
+    assert ant.pos == (-1, 0)
+
+def test_chunk_crossing():
+    big = GridMachine(initial_state='ant', transition_function=LANGTON).run(3000)
+    small = GridMachine(tape=GridTape(chunk_size=2), initial_state='ant',
+        transition_function=LANGTON).run(3000)
+    assert len(small.tape.chunks) > 4
+    assert (small.pos, small.heading) == (big.pos, big.heading)
+    assert small.tape == big.tape
+
+def test_absolute_moves():
+    trans = {
+        S('init', BLANK_SYMBOL): S('down', 'a', 'R'),
+        S('down', BLANK_SYMBOL): S('left', 'b', 'D'),
+        S('left', BLANK_SYMBOL): S('up', 'c', 'L'),
+        S('up', BLANK_SYMBOL): S('final', 'd', 'U'),
+    }
+    gm = GridMachine(transition_function=trans).run()
+    assert gm.done
+    assert gm.stepno == 4
+    assert gm.pos == (0, 0)
+    assert gm.heading == 'N'
+    assert gm.tape.render() == 'ab\ndc'
+
+def test_stuck():
+    gm = GridMachine(tape='x', transition_function=LANGTON, initial_state='ant').run(10)
+    assert gm.stuck
+    assert gm.stepno == 10
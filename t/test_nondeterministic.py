@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import pytest
+
+import turing.nondeterministic
+from turing.nondeterministic import NondeterministicTuringMachine as NTM
+from turing.nondeterministic import NondeterministicTransitionFunction, Configuration
+from turing.state import State as S
+from turing.tape import BLANK_SYMBOL
+
+# accept if there's a "11" anywhere on the tape: scan right, and on any 1
+# also guess that it's the first half of the pair
+FIND_11 = {
+    S('init', 0): S('init', 0, 'R'),
+    S('init', 1): [ S('init', 1, 'R'), S('guess', 1, 'R') ],
+    S('guess', 1): S('final', 1, 'N'),
+}
+
+# wander back and forth forever, writing nothing new
+PACE = {
+    S('init', 0): [ S('init', 0, 'L'), S('init', 0, 'R') ],
+    S('init', BLANK_SYMBOL): [ S('init', 0, 'L'), S('init', 0, 'R') ],
+}
+
+def test_transition_function():
+    tf = NondeterministicTransitionFunction(FIND_11)
+    assert len(tf(S('init', 1))) == 2
+    tf.add(S('init', 1), S('guess', 1, 'R'))
+    assert len(tf(S('init', 1))) == 2
+    tf.add(S('init', 1), S('guess', 1, 'L'))
+    assert len(tf(S('init', 1))) == 3
+    assert tf(S('nope', 1)) == ()
+
+@pytest.mark.parametrize('strategy', ['bfs', 'iddfs'])
+@pytest.mark.parametrize('tape,accept', [
+    ('0101101', True),
+    ('01010', False),
+    ('', False),
+])
+def test_find_11(strategy, tape, accept):
+    ntm = NTM(tape=tape, transition_function=FIND_11)
+    found = ntm.run(strategy=strategy)
+    if accept:
+        assert found.state == 'final'
+        assert found.stepno == 5
+        assert found.pos == 4
+        assert found.tape.strip() == tape
+    else:
+        assert found is None
+
+def test_max_steps():
+    assert NTM(tape='0101101', transition_function=FIND_11).run(max_steps=4) is None
+    assert NTM(tape='0101101', transition_function=FIND_11).run(max_steps=4, strategy='iddfs') is None
+
+def test_dedup_terminates():
+    ntm = NTM(tape='', transition_function=PACE)
+    assert ntm.run(max_steps=40) is None
+    # every reachable configuration is a run of 0s with the head somewhere
+    # on (or just off) it; without dedup this would be 2**40 branches
+    assert ntm.explored < 40 * 40 * 4
+
+def test_configuration_sharing():
+    c = Configuration.from_tape('init', '0' * 1000)
+    a, b = c.successors({ ('init', '0'): (('x', '1', 1), ('y', '0', 1)) })
+    assert b.pages is c.pages
+    shared = sum( 1 for pa, pc in zip(a.pages, c.pages) if pa is pc )
+    assert shared == len(c.pages) - 1
+    assert a.key() != b.key()
+
+def test_key_ignores_padding():
+    a = Configuration('x', 3, ('  ab',), 0)
+    b = Configuration('x', 1, ('ab        ',), 0)
+    assert a.key() == b.key()
+
+def test_workers(monkeypatch):
+    monkeypatch.setattr(turing.nondeterministic, 'PARALLEL_THRESHOLD', 2)
+    serial = NTM(tape='', transition_function=PACE)
+    parallel = NTM(tape='', transition_function=PACE)
+    assert serial.run(max_steps=12) is None
+    assert parallel.run(max_steps=12, workers=2) is None
+    assert parallel.explored == serial.explored
+
+    trans = dict(PACE)
+    trans[ S('init', 1) ] = S('final', 1, 'N')
+    trans[ S('init', 0) ] = [ S('init', 0, 'L'), S('init', 0, 'R'), S('init', 1, 'N') ]
+    found = NTM(tape='', transition_function=trans).run(workers=2)
+    assert found.state == 'final'
+    assert found.stepno == 4
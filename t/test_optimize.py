@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import pytest
+
+from turing.optimize import optimize
+from turing.machine import TuringMachine
+from turing.state import State as S
+from turing.tape import BLANK_SYMBOL as B
+
+# flip bits, but spread over redundant states: 'even' and 'odd' do the same
+# thing, 'hop' is a no-op detour, and 'lost' can't be reached at all
+BLOATED = {
+    S('init', 0): S('odd', 1, 'R'),
+    S('init', 1): S('odd', 0, 'R'),
+    S('init', B): S('hop', B, 'N'),
+    S('odd', 0): S('even', 1, '>'),
+    S('odd', 1): S('even', 0, 'R'),
+    S('odd', B): S('hop', B, 'N'),
+    S('even', 0): S('odd', 1, 'R'),
+    S('even', 1): S('odd', 0, '+'),
+    S('even', B): S('hop', B, 'N'),
+    S('hop', B): S('final', B, 'N'),
+    S('final', B): S('lost', 'x', 'L'),
+    S('lost', 0): S('final', 0, 'L'),
+}
+
+def test_optimize():
+    tf, mapping = optimize(BLOATED)
+    assert mapping == { 'init': ('init', 'odd', 'even'), 'final': ('final',) }
+    assert len(tf) == 3
+    assert tf(S('init', B)) == S('final', B, 'N')
+
+def test_no_fuse():
+    tf, mapping = optimize(BLOATED, fuse=False)
+    assert set(mapping) == { 'init', 'hop', 'final' }
+    assert len(tf) == 4
+
+@pytest.mark.parametrize('tape', [ '', '0', '010011', '1' * 9 ])
+def test_same_result(tape):
+    tf, mapping = optimize(BLOATED)
+    before = TuringMachine(tape=tape, transition_function=BLOATED).run()
+    after = TuringMachine(tape=tape, transition_function=tf).run()
+    assert after.tape == str(before.tape)
+    assert after.pos == before.pos
+    assert before.state.name in mapping[after.state.name]
+    assert after.stepno == before.stepno - 1
+
+def test_finals_stay_apart():
+    trans = {
+        S('init', 0): S('yes', 0, 'N'),
+        S('init', 1): S('no', 1, 'N'),
+    }
+    tf, mapping = optimize(trans, final_states=['yes', 'no'])
+    assert mapping == { 'init': ('init',), 'yes': ('yes',), 'no': ('no',) }
+    assert len(tf) == 2
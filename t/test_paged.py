@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import random
+import pytest
+
+from turing.tape import Tape, PagedTape, BLANK_SYMBOL
+from turing.stream import StreamTape
+from turing.machine import TuringMachine
+
+from helpers import FLIP, SmallPagedTape
+
+def test_same_as_tape():
+    rng = random.Random(42)
+    plain, paged = Tape('test'), SmallPagedTape('test')
+    for _ in range(2000):
+        idx = rng.randint(-30, 30)
+        op = rng.random()
+        if op < 0.4:
+            assert paged[idx] == plain[idx]
+        elif op < 0.8:
+            sym = rng.choice('abc' + BLANK_SYMBOL)
+            plain[idx] = sym
+            paged[idx] = sym
+        elif op < 0.9:
+            stop = idx + rng.randint(0, 6)
+            assert paged[idx:stop] == plain[idx:stop]
+        else:
+            plain[idx] = 'xy'
+            paged[idx] = 'xy'
+        assert len(paged) == len(plain)
+        assert paged.offset == plain.offset
+        assert paged == str(plain)
+
+def test_page_size():
+    tape = PagedTape('0123456789', page_size=4)
+    assert len(tape._pages) == 3
+    assert tape.fork().page_size == 4
+    assert PagedTape('0123456789').page_size == PagedTape.page_size
+
+def test_fork_copy_on_write():
+    tape = SmallPagedTape('0123456789abcdef')
+    fork = tape.fork()
+    assert fork._pages is tape._pages
+
+    fork[5] = 'X'
+    assert fork._pages is not tape._pages
+    assert tape == '0123456789abcdef'
+    assert fork == '01234X6789abcdef'
+    shared = [ a is b for a,b in zip(tape._pages, fork._pages) ]
+    assert shared == [ True, False, True, True ]
+
+    tape[-2] = 'L'
+    assert tape == 'L ' + '0123456789abcdef'
+    assert fork == '01234X6789abcdef'
+
+def test_stream_fork():
+    with pytest.raises(ValueError):
+        StreamTape(['test']).fork()
+
+def test_machine_fork():
+    tm = TuringMachine(tape='010011', transition_function=FLIP)
+    tm.run(3)
+    fork = tm.fork()
+    assert isinstance(tm.tape, PagedTape)
+    assert (fork.stepno, fork.pos, fork.state) == (tm.stepno, tm.pos, tm.state)
+
+    fork.run()
+    assert fork.done
+    assert not tm.done
+    assert fork.tape.strip() == '101100'
+    assert tm.tape == '101011'
+
+    tm.run()
+    assert tm.tape == str(fork.tape)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import io
+import pytest
+
+from turing.stream import StreamTape
+from turing.machine import TuringMachine
+from turing.tape import BLANK_SYMBOL
+
+from helpers import FLIP
+
+def _chunks(*items):
+    for item in items:
+        _chunks.pulled.append(item)
+        yield item
+
+def test_lazy_fill():
+    _chunks.pulled = list()
+    tape = StreamTape(_chunks('te', 'st', 'ing'))
+    assert _chunks.pulled == []
+    assert tape[1] == 'e'
+    assert _chunks.pulled == ['te']
+    assert tape[3] == 't'
+    assert _chunks.pulled == ['te', 'st']
+    assert tape[8] == BLANK_SYMBOL
+    assert tape.exhausted
+    assert tape == 'testing  '
+
+def test_text_and_binary_fh():
+    assert StreamTape(io.StringIO('test'), bs=3)[0:4] == 'test'
+    assert StreamTape(io.BytesIO(b'test'), bs=3)[0:4] == 'test'
+    assert StreamTape(io.BytesIO('«»«»'.encode()), bs=3)[0:4] == '«»«»'
+    # a one byte block never holds a whole «, which mustn't read as the end
+    assert StreamTape(io.BytesIO('«»ab'.encode()), bs=1)[0:4] == '«»ab'
+
+def test_truncated_binary_source():
+    with pytest.raises(UnicodeDecodeError):
+        StreamTape(io.BytesIO('ab«'.encode()[:-1]), bs=2).drain()
+
+def test_drain():
+    tape = StreamTape(io.StringIO('x' * 100), bs=7)
+    tape.drain()
+    assert len(tape) == 100
+
+def test_machine_on_stream():
+    tape = StreamTape(io.StringIO('010011' * 100), bs=16, keep_behind=4)
+    tm = TuringMachine(tape=tape, transition_function=FLIP)
+    while not tm.final:
+        tm.step()
+    assert tm.tape is tape
+    assert tape.discarded > 0
+    assert len(tape) < 600
+    assert tm.tape[596:600] == '1100'
+
+def test_discarded_region():
+    tape = StreamTape(io.StringIO('abcdefghij' * 10), bs=8, keep_behind=2)
+    assert tape[50] == 'a'
+    assert tape[48] == 'i'
+    with pytest.raises(IndexError):
+        tape[0]
+
+def test_spilled_region():
+    tape = StreamTape(io.StringIO('abcdefghij' * 10), bs=8, keep_behind=2, spill=True)
+    assert tape[50] == 'a'
+    assert tape.discarded > 0
+    assert tape[3] == 'd'
+    assert tape[-1] == BLANK_SYMBOL
+    assert tape.discarded == 0
+    tape.drain()
+    assert tape.strip() == 'abcdefghij' * 10
+    tape.close()
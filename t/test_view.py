@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import io
+import pytest
+
+import turing.view
+from turing.tape import Tape, BLANK_SYMBOL
+from turing.stream import StreamTape
+
+from helpers import SmallPagedTape
+
+@pytest.fixture(params=[ Tape, SmallPagedTape ], ids=[ 'tape', 'paged' ])
+def tape(request):
+    ret = request.param('hello world')
+    ret[-3] = 'x'
+    return ret # "x  hello world", with 'h' at 0
+
+def test_view_does_not_grow(tape):
+    before = (len(tape), tape.offset)
+    view = tape.view(-10, 20)
+    assert len(view) == 30
+    assert str(view) == '       x  hello world         '
+    assert view[0] == BLANK_SYMBOL
+    assert view[10] == 'h'
+    assert view[-1] == BLANK_SYMBOL
+    assert (len(tape), tape.offset) == before
+
+def test_default_window(tape):
+    assert tape.view() == 'x  hello world'
+    assert tape.view(0) == 'hello world'
+
+def test_slice_and_iter(tape):
+    view = tape.view(0, 11)
+    assert view[6:] == 'world'
+    assert view[6:][1:3] == 'or'
+    assert ''.join(view) == 'hello world'
+    with pytest.raises(ValueError):
+        view[::2]
+    with pytest.raises(IndexError):
+        view[11]
+
+def test_find(tape, monkeypatch):
+    monkeypatch.setattr(turing.view, 'CHUNK', 3)
+    view = tape.view(-5, 15)
+    assert view.find('world') == 11
+    assert view.find('o') == 9
+    assert view.find('o', 10) == 12
+    assert view.find('o', 0, 9) == -1
+    assert view.find('d   ') == 15
+    assert view.find('nope') == -1
+    assert 'lo w' in view
+    assert view.strip() == 'x  hello world'
+    assert view.rstrip().startswith('  x')
+
+def test_eq(tape, monkeypatch):
+    monkeypatch.setattr(turing.view, 'CHUNK', 3)
+    assert tape.view(0, 5) == 'hello'
+    assert tape.view(0, 5) != 'hellO'
+    assert tape.view(0, 5) == Tape('hello').view()
+    assert tape.view(-4, 2) == tape.view(-4, 2)
+    assert tape.view(-4, 2) != tape.view(-3, 3)
+
+def test_live(tape):
+    view = tape.view(0, 5)
+    tape[-8] = 'z'
+    tape[0] = 'j'
+    assert view == 'jello'
+
+def test_stream_view():
+    tape = StreamTape(io.StringIO('abcdefghij' * 10), bs=8, keep_behind=2)
+    assert tape[50] == 'a'
+    # views only see what the tape has loaded (and not dropped) so far
+    assert tape.view(48, 60) == 'ijabcdef' + BLANK_SYMBOL * 4
+    with pytest.raises(IndexError):
+        str(tape.view(0, 10))
@@ -1,5 +1,22 @@
 # coding: utf-8
 
-from .tape import Tape
-from .state import State
-from .machine import TuringMachine
+__version__ = '0.1.0'
+
+# the classes get imported when first used, so that python -m turing (and
+# anything else that only needs a submodule) doesn't pay for all of them
+_EXPORTS = {
+    'Tape': 'tape',
+    'StreamTape': 'stream',
+    'State': 'state',
+    'TuringMachine': 'machine',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    import importlib
+    ret = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = ret
+    return ret
@@ -0,0 +1,6 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from .cli import main
+
+main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import marshal
+import hashlib
+import logging
+
+from . import __version__
+from .compiled import compile_table
+from .transition import TransitionFunction
+
+log = logging.getLogger(__name__)
+
+CACHE_FORMAT = 2
+CACHE_ENV = 'TURING_CACHE'
+
+def table_key(transition_function):
+    """ a content hash of a transition table; insertion order doesn't matter """
+    if isinstance(transition_function, dict):
+        transition_function = TransitionFunction(transition_function)
+    items = sorted( repr((tuple(cur), tuple(nxt))) for cur,nxt in transition_function.items() )
+    return hashlib.sha256('\n'.join(items).encode()).hexdigest()
+
+def bytes_key(data):
+    """ a content hash of some raw bytes (eg, a machine file) """
+    return hashlib.sha256(data).hexdigest()
+
+class CompiledCache:
+    """ an on-disk cache of compiled machines
+
+        Entries are written with marshal, so only plain builtins (str and int
+        state names and symbols, as compile_table() makes from machine files)
+        get cached; anything else is just compiled every time.  Unlike a
+        pickle, reading an entry can't run code.  Each entry records the
+        cache format, the library version and its own key; an entry that
+        doesn't match all three is treated as a miss and will be overwritten.
+
+        The directory defaults to $TURING_CACHE, then ~/.cache/turing
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.environ.get(CACHE_ENV) or os.path.join(os.path.expanduser('~'), '.cache', 'turing')
+        self.path = path
+
+    def _fname(self, key):
+        return os.path.join(self.path, key + '.tmc')
+
+    def get(self, key, default=None):
+        try:
+            with open(self._fname(key), 'rb') as fh:
+                fmt, version, saved_key, payload = marshal.load(fh)
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            log.debug('get(%s) miss: %s', key, e)
+            return default
+
+        if (fmt, version, saved_key) != (CACHE_FORMAT, __version__, key):
+            log.debug('get(%s) stale: format=%s version=%s', key, fmt, version)
+            return default
+
+        log.debug('get(%s) hit', key)
+        return payload
+
+    def put(self, key, value):
+        try:
+            marshal.dumps(value)
+        except ValueError as e:
+            log.debug('put(%s) not cached: %s', key, e)
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        fname = self._fname(key)
+        tmp = f'{fname}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as fh:
+            marshal.dump( (CACHE_FORMAT, __version__, key, value), fh )
+        os.replace(tmp, fname) # readers never see a half written entry
+        log.debug('put(%s)', key)
+
+    def compile(self, transition_function):
+        """ compile_table(), but fetched from (or saved to) the cache """
+        key = table_key(transition_function)
+        table = self.get(key)
+        if table is None:
+            table = compile_table(transition_function)
+            self.put(key, table)
+        return table
+
+    def clear(self):
+        if os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                if name.endswith('.tmc'):
+                    os.unlink(os.path.join(self.path, name))
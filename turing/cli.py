@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# coding: utf-8
+""" turing run|bench|batch -- run machine files from the console
+
+    Machine files are either a tape written by turing.tape.save_to_tape(), or
+    JSON like this:
+
+        {
+          "initial": "init",
+          "final": ["final"],
+          "transitions": [
+            [["init", "0"], ["init", "1", "R"]],
+            [["init", "1"], ["init", "0", "R"]],
+            [["init", " "], ["final", " ", "N"]]
+          ]
+        }
+
+    This module only imports argparse, os and sys up front; json, the engines
+    and the rest get imported when a command actually needs them.
+"""
+
+import os
+import sys
+import argparse
+
+ENGINES = ('auto', 'compiled', 'step')
+
+def load_machine(path):
+    """ returns (initial, transitions, final) from a machine file """
+    with open(path, encoding='utf-8') as fh:
+        return parse_machine(fh.read())
+
+def parse_machine(content):
+    """ returns (initial, transitions, final) from the text of a machine file """
+    from .tape import STX, load_from_tape
+    if content.lstrip().startswith(STX):
+        return load_from_tape(content)
+
+    import json
+    from .state import State
+    data = json.loads(content)
+    transitions = { State(*cur): State(*nxt) for cur,nxt in data['transitions'] }
+    return data.get('initial', 'init'), transitions, data.get('final', 'final')
+
+class Runner:
+    """ builds machines for one machine file on the requested engine
+
+        The transition table gets compiled once, no matter how many tapes
+        are run through it.  Given a cache directory, a compiled machine is
+        looked up by a hash of the machine file, so a warm start skips
+        parsing and compiling altogether.
+    """
+    def __init__(self, path, engine='auto', cache=None):
+        with open(path, 'rb') as fh:
+            content = fh.read()
+        self.table = None
+        self.engine = engine
+
+        if cache is not None and engine in ('auto', 'compiled'):
+            from .cache import CompiledCache, bytes_key
+            cache = CompiledCache(cache)
+            key = bytes_key(content)
+            hit = cache.get(key)
+            if hit is not None:
+                self.initial, self.final, self.table = hit
+                self.transitions = None
+                self.engine = 'compiled'
+                return
+
+        self.initial, self.transitions, self.final = parse_machine(content.decode('utf-8'))
+
+        if engine in ('auto', 'compiled'):
+            from .compiled import compile_table
+            try:
+                self.table = compile_table(self.transitions)
+                self.engine = 'compiled'
+            except ValueError:
+                if engine == 'compiled':
+                    raise
+                self.engine = 'step'
+
+        if cache is not None and self.table is not None:
+            from .state import State, StateList
+            final = sorted( s.name for s in StateList(self.final) )
+            cache.put(key, (State(self.initial).name, final, self.table))
+
+    def machine(self, tape):
+        if self.engine == 'compiled':
+            from .compiled import CompiledMachine
+            return CompiledMachine(tape=tape, initial_state=self.initial,
+                final_states=self.final, table=self.table)
+        from .machine import TuringMachine
+        return TuringMachine(tape=tape, initial_state=self.initial,
+            final_states=self.final, transition_function=self.transitions)
+
+    def run(self, tape, max_steps=None):
+        """ returns (machine, elapsed seconds) """
+        from time import perf_counter
+        start = perf_counter()
+        tm = self.machine(tape).run(max_steps)
+        return tm, perf_counter() - start
+
+def _max_steps(args):
+    return args.max_steps if args.max_steps > 0 else None
+
+def _summary(name, tm, elapsed):
+    stuck = ' (stuck)' if tm.stuck else ''
+    return f'{name}: {tm.stepno} steps, state={tm.state.name}{stuck}, pos={tm.pos}, {elapsed:.6f}s'
+
+def _input_tape(args):
+    if args.file is None:
+        return args.tape
+    if args.file == '-':
+        return sys.stdin.read().rstrip('\r\n')
+    with open(args.file, encoding='utf-8') as fh:
+        return fh.read().rstrip('\r\n')
+
+def _batch_inputs(paths):
+    """ yields (name, tape) for every file (or directory of files) in paths,
+        or for each line of stdin if there are no paths (or the path is '-')
+    """
+    for path in paths or ['-']:
+        if path == '-':
+            for lineno, line in enumerate(sys.stdin, 1):
+                yield f'stdin:{lineno}', line.rstrip('\r\n')
+        elif os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                fname = os.path.join(path, name)
+                if os.path.isfile(fname):
+                    yield from _batch_inputs([fname])
+        else:
+            with open(path, encoding='utf-8') as fh:
+                yield path, fh.read().rstrip('\r\n')
+
+def cmd_run(args):
+    runner = Runner(args.machine, args.engine, args.cache)
+    tm, elapsed = runner.run(_input_tape(args), _max_steps(args))
+    print(_summary(runner.engine, tm, elapsed))
+    if args.print_tape:
+        print(str(tm.tape))
+
+def cmd_batch(args):
+    runner = Runner(args.machine, args.engine, args.cache)
+    max_steps = _max_steps(args)
+    count = steps = 0
+    total = 0.0
+    for name, tape in _batch_inputs(args.inputs):
+        tm, elapsed = runner.run(tape, max_steps)
+        count += 1
+        steps += tm.stepno
+        total += elapsed
+        if not args.quiet:
+            print(_summary(name, tm, elapsed))
+        if args.print_tape:
+            print(str(tm.tape))
+    rate = steps / total if total else 0
+    print(f'{count} inputs, {steps} steps, {total:.6f}s, {rate:.0f} steps/s ({runner.engine})')
+
+def cmd_bench(args):
+    tape = _input_tape(args)
+    engines = [ args.engine ] if args.engine != 'auto' else [ 'compiled', 'step' ]
+    max_steps = _max_steps(args)
+    for engine in engines:
+        try:
+            runner = Runner(args.machine, engine, args.cache)
+        except ValueError as e:
+            print(f'{engine}: unavailable ({e})')
+            continue
+        best = None
+        for _ in range(args.repeat):
+            tm, elapsed = runner.run(tape, max_steps)
+            best = elapsed if best is None else min(best, elapsed)
+        rate = tm.stepno / best if best else 0
+        print(f'{engine}: {tm.stepno} steps, best of {args.repeat}: {best:.6f}s, {rate:.0f} steps/s')
+
+def _add_common(parser):
+    parser.add_argument('-v', '--verbose', action='store_true')
+    parser.add_argument('-m', '--max-steps', type=int, default=0,
+        help='stop after this many steps (0 means no limit)')
+    parser.add_argument('-e', '--engine', choices=ENGINES, default='auto')
+    parser.add_argument('-c', '--cache', default=os.environ.get('TURING_CACHE'),
+        help='keep compiled machines in this directory (default: $TURING_CACHE)')
+    parser.add_argument('machine', help='machine file (JSON or save_to_tape format)')
+
+def _add_tape(parser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('-t', '--tape', default='', help='input tape symbols')
+    group.add_argument('-f', '--file', help="read the input tape from a file ('-' for stdin)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='turing',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('run', help='run a machine on one tape',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    _add_common(p)
+    _add_tape(p)
+    p.add_argument('-p', '--print-tape', action='store_true')
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser('batch', help='run a machine on many tapes',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    _add_common(p)
+    p.add_argument('-p', '--print-tape', action='store_true')
+    p.add_argument('-q', '--quiet', action='store_true', help='only print the totals')
+    p.add_argument('inputs', nargs='*',
+        help="tape files or directories of them ('-' or nothing: one tape per line of stdin)")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser('bench', help='time a machine on one tape on each engine',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    _add_common(p)
+    _add_tape(p)
+    p.add_argument('-n', '--repeat', type=int, default=5)
+    p.set_defaults(func=cmd_bench)
+
+    args = parser.parse_args(argv)
+    if getattr(args, 'repeat', 1) < 1:
+        parser.error('--repeat must be at least 1')
+
+    if args.verbose:
+        import logging
+        logging.basicConfig(level=logging.DEBUG)
+
+    try: args.func(args)
+    except KeyboardInterrupt: pass
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import logging
+
+from .tape import Tape, BLANK_SYMBOL
+from .state import State, StateList
+from .transition import TransitionFunction
+from .events import Observable, Event, EVENT_BATCH, WRITE, MOVE, STATE, GROW
+
+log = logging.getLogger(__name__)
+
+MIN_GROW = 64
+
+def compile_table(transition_function):
+    """ flatten a TransitionFunction into a dict of plain tuples
+
+        (cur_name, cur_tval) -> (next_name, next_tval, move)
+
+        The compiled machine keeps its tape as a list of single symbols, so
+        transitions that write nothing or write more than one symbol can't be
+        compiled and raise a ValueError.
+    """
+    if isinstance(transition_function, dict):
+        transition_function = TransitionFunction(transition_function)
+
+    table = dict()
+    for cur, nxt in transition_function.items():
+        if cur.tval is None:
+            # the step engine never reads None off the tape, so this can't match
+            continue
+        if nxt.tval is None or len(nxt.tval) != 1:
+            raise ValueError(f'cannot compile {cur!r} → {nxt!r}: writes must be a single symbol')
+        table[ (cur.name, cur.tval) ] = (nxt.name, nxt.tval, nxt.new_pos(0))
+    return table
+
+class CompiledMachine(Observable):
+    """ A TuringMachine that runs from a compiled transition table
+
+        Same constructor and results as TuringMachine (tape, pos, state and
+        stepno), but no per-step logging or State objects.  A machine with
+        no transition for its current configuration stops with stuck set,
+        as it does on the step engine.
+    """
+
+    def __init__(self, tape='', initial_state='init', final_states='final', transition_function=None, table=None):
+        if table is None:
+            table = compile_table(transition_function)
+        self.table = table
+
+        if hasattr(tape, 'drain'):
+            tape.drain()
+        tape = Tape(tape)
+
+        self.stepno = 0
+        self.pos = 0
+        self.stuck = False
+        self.initial_state = State(initial_state)
+        self.final_states = StateList(final_states)
+        self._state = self.initial_state.name
+        self._finals = frozenset( s.name for s in self.final_states )
+
+        self._cells = list(tape.tape)
+        self._offset = tape.offset
+        self._lo = 0
+        self._hi = len(self._cells)
+        log.debug('init( %s )', self)
+
+    @property
+    def tape(self):
+        ret = Tape(''.join(self._cells[self._lo:self._hi]))
+        ret.offset = self._offset - self._lo
+        return ret
+
+    @property
+    def state(self):
+        i = self.pos + self._offset
+        tval = self._cells[i] if self._lo <= i < self._hi else BLANK_SYMBOL
+        return State(self._state, tval)
+
+    @property
+    def done(self):
+        return self._state in self._finals
+    final = done
+
+    def run(self, max_steps=None):
+        """ step until a final state (or max_steps total steps) is reached
+
+            With subscribers, each step's events are built in the same loop
+            (only the kinds some stream wants) and handed to the streams
+            EVENT_BATCH at a time.
+        """
+        table = self.table
+        finals = self._finals
+        cells = self._cells
+        offset, lo, hi = self._offset, self._lo, self._hi
+        pos, state, stepno = self.pos, self._state, self.stepno
+        limit = -1 if max_steps is None else max_steps
+
+        observed = bool(self._streams)
+        if observed:
+            kinds = self._kinds
+            want_write, want_move, want_state, want_grow = ( k in kinds for k in (WRITE, MOVE, STATE, GROW) )
+            pending = self._pending
+            new = tuple.__new__ # Event() without its argument handling
+            # the tape's extent (in tape indexes) as last reported; like the
+            # step engine, a read under the head counts as growth of the step
+            # that moved it there
+            left, right = lo - offset, hi - offset
+
+        while True:
+            i = pos + offset
+            if i < 0:
+                grow = max(len(cells), MIN_GROW)
+                cells[0:0] = [BLANK_SYMBOL] * grow
+                offset += grow
+                lo += grow
+                hi += grow
+                i += grow
+            elif i >= len(cells):
+                cells.extend([BLANK_SYMBOL] * max(len(cells), MIN_GROW))
+
+            # the step engine reads under the head before each step, which
+            # grows the tape; keep track of what it would have grown to
+            if i < lo:
+                lo = i
+            elif i >= hi:
+                hi = i + 1
+
+            if state in finals or (limit >= 0 and stepno >= limit):
+                break
+
+            sym = cells[i]
+            t = table.get( (state, sym) )
+            if t is None:
+                log.debug('run stuck at step %d in %s reading %s', stepno, state, repr(sym))
+                self.stuck = True
+                if limit > stepno:
+                    stepno = limit
+                break
+
+            if observed:
+                nstate, nsym, move = t
+                n, p = stepno + 1, pos + move
+                if want_grow and not (left <= pos < right and left <= p < right):
+                    new_left, new_right = min(left, pos, p), max(right, pos + 1, p + 1)
+                    edge = new_left if new_left < left else new_right - 1
+                    pending.append( new(Event, (GROW, n, edge, right - left, new_right - new_left)) )
+                    left, right = new_left, new_right
+                if want_write:
+                    pending.append( new(Event, (WRITE, n, pos, sym, nsym)) )
+                if want_move and move:
+                    pending.append( new(Event, (MOVE, n, p, pos, p)) )
+                if want_state and nstate != state:
+                    pending.append( new(Event, (STATE, n, p, state, nstate)) )
+                if len(pending) >= EVENT_BATCH:
+                    self.flush_events()
+                    pending = self._pending
+
+            state, cells[i], move = t
+            pos += move
+            stepno += 1
+
+        self._offset, self._lo, self._hi = offset, lo, hi
+        self.pos, self._state, self.stepno = pos, state, stepno
+        if observed:
+            self.flush_events()
+        return self
+
+    def __repr__(self):
+        return f'CompiledMachine<{len(self.table)} transitions; state={self._state} pos={self.pos} step={self.stepno}>'
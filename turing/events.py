@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import logging
+import threading
+from collections import deque, namedtuple
+
+log = logging.getLogger(__name__)
+
+WRITE = 'write' # pos, old symbol, new symbol
+MOVE  = 'move'  # pos (the new one), old pos, new pos
+STATE = 'state' # pos, old state name, new state name (only when it changes)
+GROW  = 'grow'  # pos (the new edge of the tape), old length, new length
+
+KINDS = frozenset( (WRITE, MOVE, STATE, GROW) )
+
+EVENT_BATCH = 256 # machines hand events to their streams this many at a time
+
+Event = namedtuple('Event', 'kind stepno pos old new')
+
+class EventStream:
+    """ a ring buffer of machine events
+
+        Machines put() batches of events in; consumers drain() them out,
+        either directly, from a background thread (start_thread()), or from
+        asyncio (batches(), or feed_queue() into an asyncio.Queue).
+
+        When the buffer is full, overflow decides what gives:
+
+          * 'drop_oldest' -- overwrite the oldest events (a true ring)
+          * 'drop_newest' -- discard the incoming events
+          * 'block'       -- make the machine wait for a consumer
+
+        Dropped events are counted in .dropped.  kinds limits the stream to
+        some of WRITE, MOVE, STATE and GROW; machines don't even generate
+        kinds none of their streams want.
+    """
+
+    def __init__(self, capacity=65536, kinds=KINDS, overflow='drop_oldest'):
+        if overflow not in ('drop_oldest', 'drop_newest', 'block'):
+            raise ValueError(f'unknown overflow policy {overflow!r}')
+        self.capacity = capacity
+        self.kinds = frozenset(kinds)
+        self.overflow = overflow
+        self.dropped = 0
+        self.closed = False
+        self.buffer = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._feeder = False
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def put(self, events):
+        if self.kinds != KINDS:
+            events = [ e for e in events if e.kind in self.kinds ]
+        if not events:
+            return
+
+        with self._cond:
+            room = self.capacity - len(self.buffer)
+            if len(events) <= room:
+                self.buffer.extend(events)
+
+            elif self.overflow == 'drop_oldest':
+                self.buffer.extend(events)
+                excess = len(self.buffer) - self.capacity
+                for _ in range(excess):
+                    self.buffer.popleft()
+                self.dropped += excess
+
+            elif self.overflow == 'drop_newest':
+                self.buffer.extend(events[:room])
+                self.dropped += len(events) - room
+
+            else:
+                for e in events:
+                    while len(self.buffer) >= self.capacity and not self.closed:
+                        self._cond.notify_all()
+                        self._cond.wait()
+                    self.buffer.append(e)
+
+            self._cond.notify_all()
+
+    def drain(self, max_events=None):
+        """ take (up to max_events) events out of the buffer, oldest first """
+        with self._cond:
+            n = len(self.buffer) if max_events is None else min(max_events, len(self.buffer))
+            ret = [ self.buffer.popleft() for _ in range(n) ]
+            if ret:
+                self._cond.notify_all()
+            return ret
+
+    def wait(self, timeout=None):
+        """ wait for events (or close()); returns whether there are any """
+        with self._cond:
+            self._cond.wait_for(lambda: self.buffer or self.closed, timeout)
+            return bool(self.buffer)
+
+    def start_thread(self, callback, batch_size=4096, interval=0.05):
+        """ call callback(events) from a daemon thread as events arrive, until close() """
+        def _consume():
+            while True:
+                self.wait(interval)
+                events = self.drain(batch_size)
+                if events:
+                    callback(events)
+                elif self.closed:
+                    return
+        self._thread = threading.Thread(target=_consume, name='turing-events', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def feed_queue(self, queue, loop, batch_size=4096, interval=0.05):
+        """ put batches of events on an asyncio.Queue owned by loop
+
+            The thread waits for room on the queue, so a bounded queue pushes
+            back on the ring buffer (and, with overflow='block', on the machine).
+            A None goes on the queue after close().
+
+            The thread needs loop running to hand anything over, so close()
+            doesn't wait for it (that would deadlock when called from the
+            loop); await aclose() to close and wait for it to finish.
+        """
+        import asyncio
+        put = lambda events: asyncio.run_coroutine_threadsafe(queue.put(events), loop).result()
+        def _consume():
+            while True:
+                self.wait(interval)
+                events = self.drain(batch_size)
+                if events:
+                    put(events)
+                elif self.closed:
+                    put(None)
+                    return
+        self._thread = threading.Thread(target=_consume, name='turing-events', daemon=True)
+        self._feeder = True
+        self._thread.start()
+        return self._thread
+
+    async def batches(self, batch_size=4096, interval=0.01):
+        """ async iterator of event batches, until close() """
+        import asyncio
+        while True:
+            events = self.drain(batch_size)
+            if events:
+                yield events
+            elif self.closed:
+                return
+            else:
+                await asyncio.sleep(interval)
+
+    def close(self):
+        """ no more events; consumers finish draining and stop
+
+            Waits for a start_thread() thread to finish, but not for a
+            feed_queue() one (see aclose()).
+        """
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None and not self._feeder and thread is not threading.current_thread():
+            thread.join()
+
+    async def aclose(self):
+        """ close(), then wait for the feed_queue() thread without blocking the loop """
+        import asyncio
+        self.close()
+        thread = self._thread
+        if thread is not None:
+            await asyncio.get_running_loop().run_in_executor(None, thread.join)
+
+class Observable:
+    """ the subscription side of a machine
+
+        Machines only look at _streams (None without subscribers) in their
+        step loops, so an unobserved machine pays one attribute check.
+    """
+    _streams = None
+    _pending = None
+    _kinds = frozenset()
+
+    def subscribe(self, stream):
+        self._streams = (self._streams or ()) + (stream,)
+        self._kinds = frozenset().union( *(s.kinds for s in self._streams) )
+        self._pending = self._pending or list()
+        return stream
+
+    def unsubscribe(self, stream):
+        self.flush_events()
+        self._streams = tuple( s for s in self._streams or () if s is not stream ) or None
+        self._kinds = frozenset().union( *(s.kinds for s in self._streams or ()) )
+
+    def _emit(self, kind, stepno, pos, old, new):
+        if kind in self._kinds:
+            self._pending.append( Event(kind, stepno, pos, old, new) )
+            if len(self._pending) >= EVENT_BATCH:
+                self.flush_events()
+
+    def flush_events(self):
+        """ hand pending events to the streams (run() does this when it returns) """
+        pending = self._pending
+        if pending:
+            self._pending = list()
+            for s in self._streams or ():
+                s.put(pending)
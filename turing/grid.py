@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import logging
+
+from .tape import BLANK_SYMBOL
+from .state import (State, StateList, LEFT, RIGHT, UP, DOWN,
+    TURN_LEFT, TURN_RIGHT, U_TURN, FORWARD)
+from .transition import TransitionFunction
+
+log = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64
+
+# headings, clockwise from north; y grows downwards like rows on a screen
+HEADINGS = 'NESW'
+DIRECTIONS = ( (0,-1), (1,0), (0,1), (-1,0) )
+
+class GridTape:
+    """ an unbounded 2-D tape
+
+        Cells live in CHUNK_SIZE x CHUNK_SIZE chunks (flat lists, row major),
+        kept in a dict keyed by chunk coordinates and only allocated the
+        first time something touches them.  Index with (x, y).
+    """
+
+    def __init__(self, symbols='', chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.chunks = dict()
+        for y, row in enumerate(symbols.split('\n') if symbols else ()):
+            for x, sym in enumerate(row):
+                if sym != BLANK_SYMBOL:
+                    self[x, y] = sym
+
+    def chunk(self, cx, cy):
+        """ the chunk at chunk coordinates (cx, cy), allocating it if need be """
+        try:
+            return self.chunks[cx, cy]
+        except KeyError:
+            ret = self.chunks[cx, cy] = [ BLANK_SYMBOL ] * (self.chunk_size * self.chunk_size)
+            log.debug('chunk(%d, %d) allocated; %d chunks', cx, cy, len(self.chunks))
+            return ret
+
+    def __getitem__(self, xy):
+        x, y = xy
+        cs = self.chunk_size
+        c = self.chunks.get( (x // cs, y // cs) )
+        if c is None:
+            return BLANK_SYMBOL
+        return c[ (y % cs) * cs + x % cs ]
+
+    def __setitem__(self, xy, sym):
+        if len(sym) != 1:
+            raise ValueError('a grid cell holds exactly one symbol')
+        x, y = xy
+        cs = self.chunk_size
+        self.chunk(x // cs, y // cs)[ (y % cs) * cs + x % cs ] = sym
+
+    def __len__(self):
+        """ number of non-blank cells """
+        return sum( len(c) - c.count(BLANK_SYMBOL) for c in self.chunks.values() )
+
+    def __eq__(self, other):
+        if isinstance(other, GridTape):
+            return self.export() == other.export()
+        return self.render() == other
+
+    def bbox(self):
+        """ (x0, y0, x1, y1) around every non-blank cell (x1, y1 exclusive), or None """
+        cs = self.chunk_size
+        x0 = y0 = x1 = y1 = None
+        for (cx, cy), c in self.chunks.items():
+            for i, sym in enumerate(c):
+                if sym == BLANK_SYMBOL:
+                    continue
+                y, x = divmod(i, cs)
+                x += cx * cs
+                y += cy * cs
+                if x0 is None:
+                    x0, y0, x1, y1 = x, y, x+1, y+1
+                else:
+                    x0, y0 = min(x0, x), min(y0, y)
+                    x1, y1 = max(x1, x+1), max(y1, y+1)
+        return None if x0 is None else (x0, y0, x1, y1)
+
+    def export(self, window=None):
+        """ the rows of window (x0, y0, x1, y1) as strings; defaults to bbox() """
+        if window is None:
+            window = self.bbox()
+            if window is None:
+                return list()
+        x0, y0, x1, y1 = window
+        cs = self.chunk_size
+        rows = list()
+        for y in range(y0, y1):
+            row = list()
+            for x in range(x0, x1):
+                c = self.chunks.get( (x // cs, y // cs) )
+                row.append(BLANK_SYMBOL if c is None else c[ (y % cs) * cs + x % cs ])
+            rows.append(''.join(row))
+        return rows
+
+    def render(self, window=None):
+        return '\n'.join(self.export(window))
+    __str__ = render
+
+    def __repr__(self):
+        return f'##GRID:{len(self.chunks)} chunks; bbox={self.bbox()}##'
+
+def compile_action(action):
+    """ (heading_mul, heading_add, moves): new heading = (heading * mul + add) % 4 """
+    for h, moves in enumerate( (UP, RIGHT, DOWN, LEFT) ):
+        if action in moves:
+            return (0, h, True)
+    for turn, moves in ( (0, FORWARD), (1, TURN_RIGHT), (2, U_TURN), (3, TURN_LEFT) ):
+        if action in moves:
+            return (1, turn, True)
+    return (1, 0, False)
+
+def compile_grid_table(transition_function):
+    """ (cur_name, cur_tval) -> (next_name, next_tval, heading_mul, heading_add, moves) """
+    if isinstance(transition_function, dict):
+        transition_function = TransitionFunction(transition_function)
+
+    table = dict()
+    for cur, nxt in transition_function.items():
+        if cur.tval is None:
+            continue
+        if nxt.tval is None or len(nxt.tval) != 1:
+            raise ValueError(f'cannot compile {cur!r} → {nxt!r}: writes must be a single symbol')
+        table[ (cur.name, cur.tval) ] = (nxt.name, nxt.tval) + compile_action(nxt.action)
+    return table
+
+class GridMachine:
+    """ a Turing machine (turmite) on a GridTape
+
+        The head sits at pos (x, y) facing heading (one of NESW).  Actions
+        are those in turing.state: LEFT/RIGHT/UP/DOWN step west/east/north/
+        south (and face that way), the TURN_* actions turn and then step
+        forward, FORWARD just steps forward, and anything else stays put.
+        A configuration without a transition stops the machine with stuck
+        set, like CompiledMachine.
+    """
+
+    def __init__(self, tape='', initial_state='init', final_states='final', transition_function=None,
+            pos=(0,0), heading='N'):
+        self.table = compile_grid_table(transition_function)
+        self.tape = tape if isinstance(tape, GridTape) else GridTape(tape)
+        self.stepno = 0
+        self.pos = tuple(pos)
+        self.heading = heading
+        self.stuck = False
+        self.initial_state = State(initial_state)
+        self.final_states = StateList(final_states)
+        self._state = self.initial_state.name
+        self._finals = frozenset( s.name for s in self.final_states )
+
+    @property
+    def state(self):
+        return State(self._state, self.tape[self.pos])
+
+    @property
+    def done(self):
+        return self._state in self._finals
+    final = done
+
+    def step(self):
+        return self.run(self.stepno + 1)
+
+    def run(self, max_steps=None):
+        """ step until a final state (or max_steps total steps) is reached """
+        table = self.table
+        finals = self._finals
+        tape = self.tape
+        cs = tape.chunk_size
+        state, stepno = self._state, self.stepno
+        h = HEADINGS.index(self.heading)
+        limit = -1 if max_steps is None else max_steps
+
+        x, y = self.pos
+        cx, cy = x // cs, y // cs
+        lx, ly = x - cx * cs, y - cy * cs
+        chunk = tape.chunk(cx, cy)
+
+        while state not in finals and not (limit >= 0 and stepno >= limit):
+            i = ly * cs + lx
+            t = table.get( (state, chunk[i]) )
+            if t is None:
+                log.debug('run stuck at step %d in %s reading %s', stepno, state, repr(chunk[i]))
+                self.stuck = True
+                if limit > stepno:
+                    stepno = limit
+                break
+            state, chunk[i], hmul, hadd, moves = t
+            stepno += 1
+            h = (h * hmul + hadd) & 3
+            if moves:
+                dx, dy = DIRECTIONS[h]
+                lx += dx
+                ly += dy
+                # only leaving the chunk costs a dict lookup
+                if not (0 <= lx < cs and 0 <= ly < cs):
+                    cx += lx // cs
+                    cy += ly // cs
+                    lx %= cs
+                    ly %= cs
+                    chunk = tape.chunk(cx, cy)
+
+        self.pos = (cx * cs + lx, cy * cs + ly)
+        self.heading = HEADINGS[h]
+        self._state, self.stepno = state, stepno
+        return self
+
+    def __repr__(self):
+        return (f'GridMachine<{len(self.table)} transitions; state={self._state} '
+            f'pos={self.pos} heading={self.heading} step={self.stepno}>')
@@ -1,21 +1,29 @@
 #!/usr/bin/env python
 # coding: utf-8
 
+import copy
 import logging
 
-from .tape import Tape
+from .tape import Tape, PagedTape
+from .stream import StreamTape
 from .state import State, StateList
 from .transition import TransitionFunction
+from .events import Observable, WRITE, MOVE, STATE, GROW
 
 log = logging.getLogger(__name__)
 
-class TuringMachine:
+class TuringMachine(Observable):
     def __init__(self, tape='', initial_state='init', final_states='final', transition_function=None):
         if isinstance(transition_function, dict):
             transition_function = TransitionFunction(transition_function)
 
         self.stepno = 0
-        self.tape = Tape(tape)
+        self.stuck = False
+        if isinstance(tape, StreamTape):
+            # a stream can't be duplicated, so the machine takes it over as-is
+            self.tape = tape
+        else:
+            self.tape = Tape(tape)
         self.pos = 0
         self.transition_function = transition_function
         self.state = self.initial_state = State(initial_state)
@@ -54,8 +62,19 @@ class TuringMachine:
             log.debug('step(%d) null-transition', step)
             return
 
+        observed = self._streams
+        if observed:
+            pos = self.pos
+
         cur_state = self.state
         next_state = self.transition_function(cur_state)
+        if next_state is cur_state:
+            # no transition for this configuration; the machine would sit
+            # here forever, so stop it (without counting the step) instead
+            log.debug('step(%d) stuck in %s', step, repr(cur_state))
+            self.stuck = True
+            self.stepno = step
+            return
 
         log.debug('step(%d) cur-state: %s; next-state: %s; pos: %d',
             step, repr(cur_state), repr(next_state), self.pos)
@@ -68,6 +87,67 @@ class TuringMachine:
 
         self.state = next_state
 
+        if observed:
+            self._emit_step(step + 1, cur_state, next_state, pos)
+
+    def _emit_step(self, stepno, cur_state, next_state, pos):
+        # the next done check reads (and so maybe grows) the tape under the
+        # head anyway; do it now so the growth goes with this step
+        self.tape[self.pos]
+        length, offset = self._extent
+        if len(self.tape) != length:
+            if self.tape.offset != offset:
+                edge = -self.tape.offset
+            else:
+                edge = len(self.tape) - self.tape.offset - 1
+            self._emit(GROW, stepno, edge, length, len(self.tape))
+            self._extent = (len(self.tape), self.tape.offset)
+        self._emit(WRITE, stepno, pos, cur_state.tval, next_state.tval)
+        if self.pos != pos:
+            self._emit(MOVE, stepno, self.pos, pos, self.pos)
+        if next_state.name != cur_state.name:
+            self._emit(STATE, stepno, self.pos, cur_state.name, next_state.name)
+
+    def subscribe(self, stream):
+        # tape growth shows up as a change from the extent last reported
+        self._extent = (len(self.tape), self.tape.offset)
+        return super().subscribe(stream)
+
+    def fingerprint(self):
+        """ a hash of the configuration (state, pos and tape contents) """
+        return hash( (self._state.name, self.pos, self.tape.fingerprint()) )
+
+    def fork(self):
+        """ a copy of this machine (tape, pos, state and stepno) to run separately
+
+            The first fork moves the tape onto a PagedTape; after that, forks
+            share tape pages until one of them writes to a page.
+        """
+        if type(self.tape) is Tape:
+            self.tape = PagedTape(self.tape)
+        ret = copy.copy(self)
+        ret.tape = self.tape.fork()
+        # forks start out without subscribers
+        for attr in ('_streams', '_pending', '_kinds'):
+            ret.__dict__.pop(attr, None)
+        log.debug('fork( %s )', ret)
+        return ret
+
+    def run(self, max_steps=None):
+        """ step until a final state (or max_steps total steps) is reached """
+        while not self.done:
+            if max_steps is not None and self.stepno >= max_steps:
+                break
+            self.step()
+            if self.stuck:
+                # as though it had sat there until max_steps
+                if max_steps is not None and max_steps > self.stepno:
+                    self.stepno = max_steps
+                break
+        if self._streams:
+            self.flush_events()
+        return self
+
     @property
     def done(self):
         s = self.state
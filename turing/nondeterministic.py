@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import logging
+
+from .tape import Tape, BLANK_SYMBOL
+from .state import State, StateList
+from .transition import TransitionFunction
+
+log = logging.getLogger(__name__)
+
+PAGE_SIZE = 64
+PARALLEL_THRESHOLD = 256 # don't bother the worker pool with frontiers smaller than this
+
+class NondeterministicTransitionFunction(TransitionFunction):
+    """ a TransitionFunction where each State maps to a tuple of next States
+
+        add()ing the same cur_state twice adds another choice rather than
+        replacing the first; next_state may also be a list/tuple/set of
+        States.  Unknown states map to no choices at all (the branch dies).
+    """
+
+    def __init__(self, states=None):
+        super().__init__()
+        if isinstance(states, dict):
+            for k,v in states.items():
+                self.add(k, v)
+        elif states is not None:
+            raise ValueError("states argument should either be None or a dict")
+
+    def add(self, cur_state, next_state):
+        if isinstance(next_state, State):
+            next_state = (next_state,)
+        choices = self.states.setdefault(cur_state, list())
+        for ns in next_state:
+            # State only compares by name, so compare the whole thing here
+            if not any( tuple(ns) == tuple(c) for c in choices ):
+                choices.append(ns)
+
+    def get(self, cur_state, default=()):
+        return tuple(self.states.get(cur_state, default))
+
+    def items(self):
+        for k,v in self.states.items():
+            yield k,tuple(v)
+
+    __setitem__ = add
+    __call__    = __getitem__ = get
+    __iter__    = items
+
+def compile_ntable(transition_function):
+    """ (cur_name, cur_tval) -> ((next_name, next_tval, move), …) """
+    if isinstance(transition_function, dict):
+        transition_function = NondeterministicTransitionFunction(transition_function)
+
+    table = dict()
+    for cur, choices in transition_function.items():
+        if cur.tval is None:
+            continue
+        if isinstance(choices, State):
+            choices = (choices,)
+        for nxt in choices:
+            if nxt.tval is None or len(nxt.tval) != 1:
+                raise ValueError(f'cannot compile {cur!r} → {nxt!r}: writes must be a single symbol')
+        table[ (cur.name, cur.tval) ] = tuple( (n.name, n.tval, n.new_pos(0)) for n in choices )
+    return table
+
+class Configuration:
+    """ one node of the configuration tree
+
+        The tape is a tuple of PAGE_SIZE symbol pages starting at tape index
+        base.  A write replaces one page in a new tuple, so sibling branches
+        share every page neither of them has written to.
+    """
+    __slots__ = ('state', 'pos', 'pages', 'base', 'stepno')
+
+    def __init__(self, state, pos, pages, base, stepno=0):
+        self.state = state
+        self.pos = pos
+        self.pages = pages
+        self.base = base
+        self.stepno = stepno
+
+    @classmethod
+    def from_tape(cls, state, tape):
+        tape = Tape(tape)
+        symbols = tape.tape
+        pages = tuple( symbols[i:i+PAGE_SIZE].ljust(PAGE_SIZE, BLANK_SYMBOL)
+            for i in range(0, len(symbols), PAGE_SIZE) ) or (BLANK_SYMBOL * PAGE_SIZE,)
+        return cls(state, 0, pages, -tape.offset)
+
+    def _locate(self):
+        """ (pages, base, page number, index in page) for the head, growing as needed """
+        pages, base = self.pages, self.base
+        p, i = divmod(self.pos - base, PAGE_SIZE)
+        if p < 0:
+            pages = (BLANK_SYMBOL * PAGE_SIZE,) * -p + pages
+            base += p * PAGE_SIZE
+            p = 0
+        elif p >= len(pages):
+            pages = pages + (BLANK_SYMBOL * PAGE_SIZE,) * (p - len(pages) + 1)
+        return pages, base, p, i
+
+    @property
+    def read(self):
+        pages, _, p, i = self._locate()
+        return pages[p][i]
+
+    def successors(self, table):
+        pages, base, p, i = self._locate()
+        page = pages[p]
+        for name, tval, move in table.get( (self.state, page[i]), () ):
+            if tval == page[i]:
+                npages = pages
+            else:
+                npages = pages[:p] + (page[:i] + tval + page[i+1:],) + pages[p+1:]
+            yield self.__class__(name, self.pos + move, npages, base, self.stepno + 1)
+
+    def key(self):
+        """ canonical (state, head, trimmed tape); blank padding and where the
+            tape happens to sit don't matter
+        """
+        symbols = ''.join(self.pages)
+        trimmed = symbols.lstrip(BLANK_SYMBOL)
+        if not trimmed:
+            return (self.state, 0, '')
+        first = self.base + len(symbols) - len(trimmed)
+        return (self.state, self.pos - first, trimmed.rstrip(BLANK_SYMBOL))
+
+    @property
+    def tape(self):
+        ret = Tape(''.join(self.pages))
+        ret.offset = -self.base
+        return ret
+
+    def __repr__(self):
+        return f'Configuration<state={self.state} pos={self.pos} step={self.stepno} {self.tape!r}>'
+
+_worker_table = None
+
+def _init_worker(table):
+    global _worker_table
+    _worker_table = table
+
+def _expand(chunk):
+    return [ s for c in chunk for s in c.successors(_worker_table) ]
+
+class NondeterministicTuringMachine:
+    """ a Turing machine whose transitions may offer several next states
+
+        run() searches the configuration tree for a path to a final state,
+        either breadth first ('bfs') or by iterative deepening ('iddfs'),
+        skipping configurations it has already seen.  With workers > 1 the
+        bfs frontier gets expanded on a process pool.
+    """
+
+    def __init__(self, tape='', initial_state='init', final_states='final', transition_function=None):
+        self.table = compile_ntable(transition_function or dict())
+        self.initial_state = State(initial_state)
+        self.final_states = StateList(final_states)
+        self._finals = frozenset( s.name for s in self.final_states )
+        self.start = Configuration.from_tape(self.initial_state.name, tape)
+        self.explored = 0
+        self.accepted = None
+
+    def run(self, max_steps=None, strategy='bfs', workers=None):
+        """ returns the accepting Configuration (also kept in self.accepted), or None """
+        self.explored = 0
+        if strategy == 'bfs':
+            self.accepted = self._bfs(max_steps, workers)
+        elif strategy == 'iddfs':
+            self.accepted = self._iddfs(max_steps)
+        else:
+            raise ValueError(f'unknown search strategy {strategy!r}')
+        return self.accepted
+
+    def _bfs(self, max_steps, workers):
+        if self.start.state in self._finals:
+            return self.start
+
+        seen = { self.start.key() }
+        frontier = [ self.start ]
+        pool = None
+        if workers is not None and workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(self.table,))
+
+        try:
+            depth = 0
+            while frontier and (max_steps is None or depth < max_steps):
+                depth += 1
+                if pool is not None and len(frontier) >= PARALLEL_THRESHOLD:
+                    size = -(-len(frontier) // (workers * 4))
+                    chunks = [ frontier[i:i+size] for i in range(0, len(frontier), size) ]
+                    expanded = ( s for chunk in pool.map(_expand, chunks) for s in chunk )
+                else:
+                    expanded = ( s for c in frontier for s in c.successors(self.table) )
+
+                frontier = list()
+                for c in expanded:
+                    self.explored += 1
+                    if c.state in self._finals:
+                        return c
+                    key = c.key()
+                    if key not in seen:
+                        seen.add(key)
+                        frontier.append(c)
+                log.debug('_bfs depth=%d frontier=%d seen=%d', depth, len(frontier), len(seen))
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def _iddfs(self, max_steps):
+        limit = 0
+        while max_steps is None or limit <= max_steps:
+            # key -> most steps left when we last got there; coming back with
+            # fewer left can't find anything new
+            best = dict()
+            cut_off = False
+            stack = [ self.start ]
+            while stack:
+                c = stack.pop()
+                self.explored += 1
+                if c.state in self._finals:
+                    return c
+                left = limit - c.stepno
+                key = c.key()
+                if best.get(key, -1) >= left:
+                    continue
+                best[key] = left
+                if left == 0:
+                    cut_off = cut_off or bool(self.table.get( (c.state, c.read) ))
+                    continue
+                stack.extend(reversed(list(c.successors(self.table))))
+            log.debug('_iddfs limit=%d seen=%d cut_off=%s', limit, len(best), cut_off)
+            if not cut_off:
+                return
+            limit += 1
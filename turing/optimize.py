@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import logging
+
+from .state import State, StateList
+from .transition import TransitionFunction
+
+log = logging.getLogger(__name__)
+
+def _fuse(table, finals):
+    """ short-circuit transitions that neither write nor move
+
+        (A, s) → (B, s, no move) reads s again in B straight away, so (A, s)
+        can go wherever (B, s) goes.  Chains into a final state, into a
+        missing transition or around a loop are left where they stop.
+    """
+    fused = dict()
+    for (name, sym), nxt in table.items():
+        seen = { name }
+        while (nxt.tval == sym and nxt.new_pos(0) == 0 and nxt.name not in finals
+                and nxt.name not in seen and (nxt.name, sym) in table):
+            seen.add(nxt.name)
+            nxt = table[ (nxt.name, sym) ]
+        fused[ (name, sym) ] = nxt
+    return fused
+
+def _reachable(table, initial, finals):
+    """ state names the machine can get to from initial """
+    edges = dict()
+    for (name, _), nxt in table.items():
+        edges.setdefault(name, list()).append(nxt.name)
+
+    seen = { initial }
+    todo = [ initial ]
+    while todo:
+        name = todo.pop()
+        if name in finals:
+            continue # it stops here; its transitions never fire
+        for n in edges.get(name, ()):
+            if n not in seen:
+                seen.add(n)
+                todo.append(n)
+    return seen
+
+def _partition(states, table, finals):
+    """ state name -> block number, merging states that behave the same
+
+        Each final state gets a block to itself (their names are the
+        answer); the others start out together and get split by what they
+        do for each symbol until nothing splits any further.
+    """
+    blocks = { s: (('final', s) if s in finals else ('run',)) for s in states }
+    count = None
+    while True:
+        sigs = dict()
+        for s in states:
+            sig = [ blocks[s] ]
+            if s not in finals:
+                sig.extend(sorted( (sym, nxt.tval, nxt.new_pos(0), blocks[nxt.name])
+                    for (name, sym), nxt in table.get(s, ()) ))
+            sigs[s] = tuple(sig)
+        ids = dict()
+        blocks = { s: ids.setdefault(sigs[s], len(ids)) for s in states }
+        log.debug('_partition %d blocks', len(ids))
+        if len(ids) == count:
+            return blocks
+        count = len(ids)
+
+def optimize(transition_function, initial_state='init', final_states='final', fuse=True):
+    """ a smaller TransitionFunction that computes the same thing
+
+        Drops states the initial state can't reach (and transitions out of
+        final states, which never fire), merges states that behave the same
+        and, if fuse is set, short-circuits transitions that neither write
+        nor move -- which is the one change that alters the step count.
+
+        Returns (transition_function, mapping) where mapping takes each
+        remaining state name to a tuple of the original names merged into it.
+    """
+    if isinstance(transition_function, dict):
+        transition_function = TransitionFunction(transition_function)
+
+    initial = State(initial_state).name
+    finals = frozenset( s.name for s in StateList(final_states) )
+
+    # transitions keyed on a None tval can never match a symbol on the tape
+    table = { (cur.name, cur.tval): nxt for cur, nxt in transition_function.items() if cur.tval is not None }
+    if fuse:
+        table = _fuse(table, finals)
+
+    states = _reachable(table, initial, finals)
+    table = { k: v for k,v in table.items() if k[0] in states and k[0] not in finals }
+
+    by_state = dict()
+    for (name, sym), nxt in table.items():
+        by_state.setdefault(name, list()).append( ((name, sym), nxt) )
+    blocks = _partition(states, by_state, finals)
+
+    # name each block after its first member, but never lose the initial state's name
+    order = [ initial ] + [ name for name,_ in table if name != initial ]
+    order += sorted( states.difference(order), key=repr )
+    groups = dict()
+    for name in dict.fromkeys(order):
+        groups.setdefault(blocks[name], list()).append(name)
+    mapping = dict()
+    rep = dict()
+    for members in groups.values():
+        mapping[members[0]] = tuple(members)
+        for n in members:
+            rep[n] = members[0]
+
+    ret = TransitionFunction()
+    for (name, sym), nxt in table.items():
+        if rep[name] == name:
+            ret.add(State(name, sym), State(rep[nxt.name], nxt.tval, nxt.action))
+
+    log.debug('optimize %d → %d transitions, %d → %d states',
+        len(transition_function), len(ret), len(states), len(mapping))
+    return ret, mapping
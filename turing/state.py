@@ -4,6 +4,16 @@
 LEFT  = ('L', '-1', '-', '-1', '<', '←', '<-')
 RIGHT = ('R', '1', '+', '+1', '>', '→', '->')
 
+# these only mean something on a 2-D tape (see turing.grid), where LEFT and
+# RIGHT move west and east; the turns are relative to the head's heading
+# and then step forward
+UP         = ('U', '^', '↑')
+DOWN       = ('D', 'v', '↓')
+TURN_LEFT  = ('TL', '↺')
+TURN_RIGHT = ('TR', '↻')
+U_TURN     = ('TU', '↷')
+FORWARD    = ('F', 'FW')
+
 class StateList:
     def __init__(self, *args):
         self.items = set()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import codecs
+import logging
+
+from .tape import Tape, FP_MOD, fingerprint_symbols
+
+log = logging.getLogger(__name__)
+
+SPILL_WIDTH = 4 # bytes per symbol in the spill file (utf-32-le is fixed width)
+
+class StreamTape(Tape):
+    """ A Tape whose right hand side is filled lazily from a source
+
+        The source can be a filehandle (anything with a .read()), or any
+        iterable of strings (a list of chunks, a generator, a socket's
+        makefile(), etc).  The tape only pulls from the source when the head
+        (or a slice) first moves past the symbols loaded so far, and then only
+        reads in blocks of 'bs' symbols.
+
+        If keep_behind is set, the tape assumes the machine will never return
+        further than keep_behind symbols left of the furthest point it has
+        accessed, and drops that region from memory.  Reaching back into a
+        dropped region raises an IndexError -- unless spill is set, in which
+        case the dropped region is written to disk and read back on demand.
+        spill may be True (use a TemporaryFile) or a binary filehandle opened
+        for reading and writing.
+    """
+
+    def __init__(self, source=(), bs=1024, keep_behind=None, spill=None):
+        super().__init__()
+        self.bs = bs
+        self.keep_behind = keep_behind
+        self.discarded = 0
+        self._discarded_fp = 0
+
+        if hasattr(source, 'read'):
+            chunks = iter(lambda: source.read(bs), source.read(0))
+        else:
+            chunks = iter(source)
+        # multibyte symbols may straddle a block boundary of a binary source
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        def _read():
+            # a block may end partway through a symbol and decode to nothing,
+            # which isn't the end of the source; only running dry is
+            for r in chunks:
+                if isinstance(r, bytes):
+                    r = decoder.decode(r)
+                if r:
+                    return r
+            # a truncated symbol at the very end raises a UnicodeDecodeError
+            return decoder.decode(b'', final=True)
+        self._read = _read
+        self.exhausted = False
+
+        if spill is True:
+            import tempfile # it's not cheap to import, and rarely needed
+            spill = tempfile.TemporaryFile()
+        self.spill = spill
+
+    def _fill(self, stop):
+        """ pull from the source until the loaded tape covers stop (or the source runs dry) """
+        while not self.exhausted and len(self.tape) < stop:
+            r = self._read()
+            if r:
+                if self._fp is not None:
+                    self._fp = (self._fp + fingerprint_symbols(r, len(self.tape) - self.offset)) % FP_MOD
+                self.tape += r
+                log.debug('_fill read %d symbols; loaded=%d', len(r), len(self.tape))
+            else:
+                self.exhausted = True
+                log.debug('_fill source exhausted; loaded=%d', len(self.tape))
+
+    def drain(self):
+        """ load the rest of the source onto the tape """
+        while not self.exhausted:
+            self._fill(len(self.tape) + self.bs)
+
+    def _discard(self, upto):
+        """ drop (or spill) the first 'upto' loaded symbols """
+        dropped = self.tape[:upto]
+        # dropped symbols are still on the tape as far as fingerprint() goes
+        self._discarded_fp = (self._discarded_fp + fingerprint_symbols(dropped, -self.offset)) % FP_MOD
+        if self.spill is not None:
+            self.spill.seek(self.discarded * SPILL_WIDTH)
+            self.spill.write(dropped.encode('utf-32-le'))
+        self.tape = self.tape[upto:]
+        self.offset -= upto
+        self.discarded += upto
+        self.io_pos = max(0, self.io_pos - upto)
+        log.debug('_discard dropped %d symbols; discarded=%d', upto, self.discarded)
+
+    def _restore(self, count):
+        """ read the last 'count' discarded symbols back from the spill file """
+        count = min(self.discarded, max(count, self.bs))
+        start = self.discarded - count
+        self.spill.seek(start * SPILL_WIDTH)
+        restored = self.spill.read(count * SPILL_WIDTH).decode('utf-32-le')
+        self.spill.truncate(start * SPILL_WIDTH)
+        self.tape = restored + self.tape
+        self.offset += count
+        self._discarded_fp = (self._discarded_fp - fingerprint_symbols(restored, -self.offset)) % FP_MOD
+        self.discarded = start
+        self.io_pos += count
+        log.debug('_restore restored %d symbols; discarded=%d', count, self.discarded)
+
+    def __getitem__(self, idx, crash_if_recurse=False, already_offset=False):
+        if already_offset:
+            raise ValueError('StreamTape does not take pre-offset indexes')
+        sidx = self._offset_idx(idx)
+
+        if sidx.start < 0 and self.discarded:
+            if self.spill is None:
+                raise IndexError(f'tape region before {-self.offset} was discarded')
+            self._restore(-sidx.start)
+            return self[idx]
+
+        self._fill(sidx.stop)
+        ret = super().__getitem__(idx, crash_if_recurse=crash_if_recurse)
+
+        if self.keep_behind is not None:
+            # the offset may have moved while the tape grew, so look again
+            excess = self._offset_idx(idx).start - self.keep_behind
+            if excess >= self.bs:
+                self._discard(excess)
+
+        return ret
+
+    def peek(self, idx):
+        if idx + self.offset < 0 and self.discarded:
+            raise IndexError(f'tape region before {-self.offset} was discarded')
+        return super().peek(idx)
+
+    def symbols(self, start, stop):
+        if start + self.offset < 0 and self.discarded:
+            raise IndexError(f'tape region before {-self.offset} was discarded')
+        return super().symbols(start, stop)
+
+    def fingerprint(self):
+        """ like Tape.fingerprint(), covering the loaded and the discarded region, but
+            not what's still waiting in the source
+        """
+        if self._fp is None:
+            self._fp = (fingerprint_symbols(self.tape, -self.offset) + self._discarded_fp) % FP_MOD
+        return self._fp
+
+    def fork(self):
+        raise ValueError('a StreamTape can not be forked; its source can only be read once')
+
+    def close(self):
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
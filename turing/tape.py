@@ -4,6 +4,8 @@
 import re
 import logging
 
+from .state import State
+
 log = logging.getLogger(__name__)
 
 NULL = '\x00'
@@ -23,8 +25,26 @@ BLANK_SYMBOL = ' '
 PRINTABLE = bytearray(range(0x20, 0x7e+1)).decode() \
           + '«»'
 
+# Tape.fingerprint() is sum( f(sym) * FP_BASE**idx ) % FP_MOD over the tape
+# indexes, where f(BLANK_SYMBOL) is 0 -- so blank padding (and growing the
+# tape with it) doesn't change the fingerprint, and writing one symbol only
+# changes one term
+FP_MOD  = (1 << 61) - 1
+FP_BASE = 1_000_003
+
+def _fp_sym(sym):
+    return 0 if sym == BLANK_SYMBOL else ord(sym) + 1
+
+def fingerprint_symbols(symbols, start=0):
+    """ the fingerprint terms of symbols, the first of which sits at tape index start """
+    h = 0
+    for sym in reversed(symbols):
+        h = (h * FP_BASE + _fp_sym(sym)) % FP_MOD
+    return h * pow(FP_BASE, start, FP_MOD) % FP_MOD
+
 class Tape:
     offset = 0
+    _fp = None
 
     @classmethod
     def read_file(cls, fh, bs=1024):
@@ -43,6 +63,7 @@ class Tape:
         if isinstance(symbols, Tape):
             self.tape = symbols.tape
             self.offset = symbols.offset
+            self._fp = symbols._fp
         else:
             self.tape = symbols
         self.io_pos = 0
@@ -66,6 +87,24 @@ class Tape:
     def __len__(self):
         return len(self.tape)
 
+    def fingerprint(self):
+        """ a hash of the symbols on the tape that ignores blank padding
+
+            The first call costs a pass over the tape; after that it's kept
+            up to date as single symbols get written.  Writes that shift the
+            tape (multi-symbol writes, write(), replace()) make the next call
+            start over.
+        """
+        if self._fp is None:
+            self._fp = fingerprint_symbols(self.tape, -self.offset)
+        return self._fp
+
+    def _fp_write(self, idx, old, new):
+        if self._fp is not None:
+            d = _fp_sym(new) - _fp_sym(old)
+            if d:
+                self._fp = (self._fp + d * pow(FP_BASE, idx, FP_MOD)) % FP_MOD
+
     def _offset_idx(self, idx):
         orig = idx
         if isinstance(idx, slice):
@@ -122,6 +161,11 @@ class Tape:
         got = self[idx] # potentially expand tape
         log.debug('__setitem__1 got="%s" for [%s]', got, repr(idx))
 
+        if isinstance(idx, int) and len(symbols) == 1:
+            self._fp_write(idx, got, symbols)
+        else:
+            self._fp = None
+
         idx = self._offset_idx(idx)
         if idx.start < 0:
             by = abs(idx.start)
@@ -137,6 +181,32 @@ class Tape:
 
         log.debug('__setitem__F %s', repr(self))
 
+    def peek(self, idx):
+        """ the symbol at idx, without growing the tape to get there """
+        i = idx + self.offset
+        return self.tape[i] if 0 <= i < len(self.tape) else BLANK_SYMBOL
+
+    def symbols(self, start, stop):
+        """ the symbols from start to stop (tape indexes), without growing the tape """
+        a, b = start + self.offset, stop + self.offset
+        n = len(self.tape)
+        if 0 <= a and b <= n:
+            return self.tape[a:b]
+        if b <= 0 or a >= n:
+            return BLANK_SYMBOL * max(0, b - a)
+        return BLANK_SYMBOL * -min(a, 0) + self.tape[max(a, 0):min(b, n)] + BLANK_SYMBOL * max(0, b - n)
+
+    def view(self, start=None, stop=None):
+        """ a read-only TapeView of start to stop (tape indexes; defaults to the
+            whole tape as it is right now)
+        """
+        from .view import TapeView
+        if start is None:
+            start = -self.offset
+        if stop is None:
+            stop = len(self) - self.offset
+        return TapeView(self, start, stop)
+
     def strip(self, *a, **kw):
         return self.tape.strip(*a, **kw)
 
@@ -183,6 +253,7 @@ class Tape:
         after  = self.tape[self.io_pos+len(blah):]
         self.tape = before + blah + after
         self.io_pos += len(blah)
+        self._fp = None
 
     def replace(self, pattern, replacement):
         """ replace pattern with replacement in the internal tape and re-adjust
@@ -198,6 +269,123 @@ class Tape:
         tmp = self.tape.replace(pattern, replacement)
         self.offset = tmp.index(mark)
         self.tape = tmp.replace(mark, '')
+        self._fp = None
+
+    def fork(self):
+        """ a copy of the tape that can be written without touching this one """
+        return self.__class__(self)
+
+class PagedTape(Tape):
+    """ a Tape kept in fixed-size pages, shared copy-on-write between forks
+
+        fork()ing shares the page list; the first write to either tape after
+        that copies the list (page references only) and each write replaces
+        just the one page it lands on.  Single symbol reads and writes, which
+        is all a running machine does, go straight to the pages; everything
+        else falls back to the Tape code through the .tape property.
+
+        page_size defaults to the class's; forks keep the page size of the
+        tape they were forked from.
+    """
+    page_size = 256
+
+    def __init__(self, symbols='', page_size=None):
+        if isinstance(symbols, PagedTape):
+            self.page_size = symbols.page_size
+            self._pages = symbols._pages
+            self._start = symbols._start
+            self._len = symbols._len
+            self._shared = symbols._shared = True
+            self.offset = symbols.offset
+            self._fp = symbols._fp
+            self.io_pos = 0
+        else:
+            if page_size is not None:
+                self.page_size = page_size
+            super().__init__(symbols)
+
+    @property
+    def tape(self):
+        return ''.join(self._pages)[self._start:self._start + self._len]
+
+    @tape.setter
+    def tape(self, symbols):
+        ps = self.page_size
+        self._pages = [ symbols[i:i+ps].ljust(ps, BLANK_SYMBOL) for i in range(0, len(symbols), ps) ]
+        self._start = 0
+        self._len = len(symbols)
+        self._shared = False
+
+    def __len__(self):
+        return self._len
+
+    def peek(self, idx):
+        i = idx + self.offset
+        if 0 <= i < self._len:
+            p, j = divmod(self._start + i, self.page_size)
+            return self._pages[p][j]
+        return BLANK_SYMBOL
+
+    def symbols(self, start, stop):
+        # only join the pages the window covers
+        ps = self.page_size
+        a, b = max(start + self.offset, 0), min(stop + self.offset, self._len)
+        if a >= b:
+            return BLANK_SYMBOL * max(0, stop - start)
+        p0, p1 = (self._start + a) // ps, (self._start + b - 1) // ps + 1
+        skip = self._start + a - p0 * ps
+        inside = ''.join(self._pages[p0:p1])[skip:skip + b - a]
+        return BLANK_SYMBOL * (a - start - self.offset) + inside + BLANK_SYMBOL * (stop + self.offset - b)
+
+    def _own_pages(self):
+        if self._shared:
+            self._pages = list(self._pages)
+            self._shared = False
+
+    def _cell(self, idx):
+        """ (page, index in page) for tape index idx, growing the tape to reach it """
+        ps = self.page_size
+        i = idx + self.offset
+
+        if i < 0:
+            self._own_pages()
+            d = -i
+            if d > self._start:
+                n = -(-(d - self._start) // ps)
+                self._pages[0:0] = [ BLANK_SYMBOL * ps ] * n
+                self._start += n * ps
+            self._start -= d
+            self._len += d
+            self.offset += d
+            i = 0
+            log.debug('_cell grew left by %d', d)
+
+        elif i >= self._len:
+            c = self._start + i
+            if c >= len(self._pages) * ps:
+                self._own_pages()
+                n = c // ps + 1 - len(self._pages)
+                self._pages.extend([ BLANK_SYMBOL * ps ] * n)
+            self._len = i + 1
+
+        return divmod(self._start + i, ps)
+
+    def __getitem__(self, idx, crash_if_recurse=False, already_offset=False):
+        if isinstance(idx, int) and not already_offset:
+            p, j = self._cell(idx)
+            return self._pages[p][j]
+        return super().__getitem__(idx, crash_if_recurse=crash_if_recurse, already_offset=already_offset)
+
+    def __setitem__(self, idx, symbols):
+        if isinstance(idx, int) and len(symbols) == 1:
+            p, j = self._cell(idx)
+            page = self._pages[p]
+            if page[j] != symbols:
+                self._fp_write(idx, page[j], symbols)
+                self._own_pages()
+                self._pages[p] = page[:j] + symbols + page[j+1:]
+            return
+        super().__setitem__(idx, symbols)
 
 def _save_state(state):
     state = tuple( str(x) for x in state if x is not None )
@@ -268,3 +456,28 @@ def save_to_tape(initial, transitions, final, debug_control_codes=False):
            .replace(US,  '<US>')
 
     return ret
+
+def _load_state(saved):
+    return State(*saved.split(US)[:-1])
+
+def load_from_tape(tape):
+    """ the inverse of save_to_tape()
+
+        returns (initial, transitions, final) where initial is a State,
+        transitions is a dict of State → State, and final is a list of States
+    """
+    # blanks (and a trailing newline, if it's been through a file) around STX … ETX
+    tape = str(tape).strip(BLANK_SYMBOL + '\r\n')
+    if not tape.startswith(STX) or not tape.endswith(ETX):
+        raise ValueError('tape does not hold a saved state table (STX … ETX)')
+
+    initial, transitions, final = tape[1:-1].split(GS)
+    transitions = [ _load_state(x) for x in transitions.split(RS) if x ]
+    if len(transitions) % 2:
+        raise ValueError('saved transitions should come in (cur, next) pairs')
+
+    return (
+        _load_state(initial),
+        dict(zip(transitions[0::2], transitions[1::2])),
+        [ _load_state(x) for x in final.split(RS) if x ],
+    )
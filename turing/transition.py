@@ -21,6 +21,9 @@ class TransitionFunction:
             default = cur_state
         return self.states.get(cur_state, default)
 
+    def __len__(self):
+        return len(self.states)
+
     def items(self):
         for k,v in self.states.items():
             yield k,v
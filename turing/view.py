@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from .tape import Tape, BLANK_SYMBOL
+
+CHUNK = 4096
+
+class TapeView:
+    """ a read-only window onto a live tape
+
+        The window is tape indexes start to stop; reading it never grows or
+        changes the tape, and anything beyond the tape reads as blank.  The
+        view doesn't copy the tape: indexing, iteration, comparison and
+        find() either work on the tape's own string or walk the window a
+        CHUNK at a time.  str() is the one thing that copies the window out.
+
+        Views see writes made to the tape after they were taken.  On a
+        StreamTape they only see what has been loaded so far, and reading a
+        discarded region raises an IndexError.
+    """
+
+    def __init__(self, tape, start, stop):
+        self.tape = tape
+        self.start = start
+        self.stop = max(start, stop)
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def _inside(self):
+        """ (a, b) string indexes of the window, if the window lies inside a
+            plain Tape's string (so str methods can work on it in place)
+        """
+        if type(self.tape) is Tape:
+            a, b = self.start + self.tape.offset, self.stop + self.tape.offset
+            if 0 <= a and b <= len(self.tape.tape):
+                return a, b
+
+    def _chunks(self, overlap=0):
+        """ yields (view index, symbols) over the window, each chunk also
+            holding the first overlap symbols of the next
+        """
+        for i in range(self.start, self.stop, CHUNK):
+            yield i - self.start, self.tape.symbols(i, min(i + CHUNK + overlap, self.stop))
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            if step != 1:
+                raise ValueError('TapeView slices must be contiguous')
+            return self.__class__(self.tape, self.start + start, self.start + stop)
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('TapeView index out of range')
+        return self.tape.peek(self.start + idx)
+
+    def __iter__(self):
+        for _, chunk in self._chunks():
+            yield from chunk
+
+    def find(self, sub, start=0, stop=None):
+        """ index of the first sub in the view (or view[start:stop]), or -1 """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        view = self[start:stop]
+
+        inside = view._inside()
+        if inside is not None:
+            i = view.tape.tape.find(sub, *inside)
+            return -1 if i < 0 else i - inside[0] + start
+
+        for i, chunk in view._chunks(overlap=max(len(sub) - 1, 0)):
+            j = chunk.find(sub)
+            if j >= 0:
+                return i + j + start
+        return -1
+
+    def __contains__(self, sub):
+        return self.find(sub) >= 0
+
+    def startswith(self, prefix):
+        if len(prefix) > len(self):
+            return False
+        return self[:len(prefix)] == prefix
+
+    def __eq__(self, other):
+        if isinstance(other, TapeView):
+            if len(other) != len(self):
+                return False
+            return all( a == other.tape.symbols(other.start + i, other.start + i + len(a))
+                for i, a in self._chunks() )
+        if not isinstance(other, str):
+            return NotImplemented
+        if len(other) != len(self):
+            return False
+        inside = self._inside()
+        if inside is not None:
+            return self.tape.tape.startswith(other, *inside)
+        return all( chunk == other[i:i + len(chunk)] for i, chunk in self._chunks() )
+
+    def _strip_bounds(self, left, right):
+        start, stop = self.start, self.stop
+        peek = self.tape.peek
+        while left and start < stop and peek(start) == BLANK_SYMBOL:
+            start += 1
+        while right and stop > start and peek(stop - 1) == BLANK_SYMBOL:
+            stop -= 1
+        return self.__class__(self.tape, start, stop)
+
+    def strip(self):
+        """ a narrower view without the blanks at either end """
+        return self._strip_bounds(True, True)
+
+    def lstrip(self):
+        return self._strip_bounds(True, False)
+
+    def rstrip(self):
+        return self._strip_bounds(False, True)
+
+    def __str__(self):
+        return self.tape.symbols(self.start, self.stop)
+
+    def __repr__(self):
+        return f'TapeView<{self.start}:{self.stop}>'